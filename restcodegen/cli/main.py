@@ -1,6 +1,20 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
 import click
 
-from restcodegen.generator.parser import Parser
+from restcodegen.generator.batch import (
+    DEFAULT_BATCH_CONFIG,
+    BatchConfigError,
+    BatchGenerationError,
+    generate_all,
+    load_batch_config,
+)
+from restcodegen.generator.models_layout import MODELS_LAYOUTS, ModelsLayout
+from restcodegen.generator.parser import MODEL_BACKENDS, ModelBackend, Parser
+from restcodegen.generator.profiling import ProfileFormat, profiling
+from restcodegen.generator.spec.pruner import OperationFilter, OperationFilterError
 from restcodegen.generator.codegen import RESTClientGenerator
 from restcodegen.generator.utils import format_file
 
@@ -9,6 +23,91 @@ from restcodegen.generator.utils import format_file
 def cli() -> None: ...
 
 
+def profile_options(command: Callable[..., Any]) -> Callable[..., Any]:
+    options = [
+        click.option(
+            "--profile",
+            is_flag=True,
+            help="Print wall time and peak memory of every pipeline stage",
+        ),
+        click.option(
+            "--profile-output",
+            required=False,
+            type=click.Path(dir_okay=False, writable=True),
+            help="Write the profile to a file (implies --profile)",
+            default=None,
+        ),
+        click.option(
+            "--profile-format",
+            required=False,
+            type=click.Choice(["json", "chrome"]),
+            help="Format of --profile-output: plain JSON or Chrome trace events",
+            default="json",
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def split_option(value: str | None) -> tuple[str, ...]:
+    return tuple(item.strip() for item in value.split(",") if item.strip()) if value else ()
+
+
+def filter_options(command: Callable[..., Any]) -> Callable[..., Any]:
+    options = [
+        click.option(
+            f"--{mode}-{kind}",
+            required=False,
+            type=str,
+            help=f"{mode.capitalize()} only {description} (comma-separated)"
+            if mode == "include"
+            else f"Exclude {description} (comma-separated)",
+            default=None,
+        )
+        for kind, description in (
+            ("paths", "operations whose path matches one of the globs, e.g. '/pets/*'"),
+            ("operations", "operations with these operationIds"),
+            ("methods", "operations with these HTTP methods"),
+        )
+        for mode in ("include", "exclude")
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def build_operation_filter(
+    include_paths: str | None,
+    exclude_paths: str | None,
+    include_operations: str | None,
+    exclude_operations: str | None,
+    include_methods: str | None,
+    exclude_methods: str | None,
+) -> OperationFilter:
+    return OperationFilter(
+        include_paths=split_option(include_paths),
+        exclude_paths=split_option(exclude_paths),
+        include_operation_ids=split_option(include_operations),
+        exclude_operation_ids=split_option(exclude_operations),
+        include_methods=split_option(include_methods),
+        exclude_methods=split_option(exclude_methods),
+    )
+
+
+@contextmanager
+def maybe_profile(profile: bool, profile_output: str | None, profile_format: ProfileFormat) -> Iterator[None]:
+    if not profile and profile_output is None:
+        yield
+        return
+
+    with profiling() as profiler:
+        yield
+    click.echo(profiler.format_table(), err=True)
+    if profile_output is not None:
+        profiler.write(profile_output, profile_format)
+
+
 @click.command("generate")
 @click.option(
     "--url",
@@ -55,6 +154,41 @@ def cli() -> None: ...
     help="Output directory for generated clients (default: ./clients/http)",
     default=None,
 )
+@click.option(
+    "--incremental",
+    "-i",
+    is_flag=True,
+    help="Regenerate only files whose spec slice, templates or options changed since the previous run",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    required=False,
+    type=click.IntRange(min=1),
+    help="Number of worker processes used to render API clients",
+    default=1,
+)
+@click.option(
+    "--models-layout",
+    required=False,
+    type=click.Choice(MODELS_LAYOUTS),
+    help="'single' writes every model to api_models.py; 'tag' splits models into one module per tag",
+    default="single",
+)
+@click.option(
+    "--model-backend",
+    required=False,
+    type=click.Choice(list(MODEL_BACKENDS)),
+    help="Library of the generated models: pydantic v2 models or msgspec structs (requires msgspec at runtime)",
+    default="pydantic",
+)
+@click.option(
+    "--lazy-exports",
+    is_flag=True,
+    help="Import API classes in the service package __init__ on first access instead of eagerly",
+)
+@filter_options
+@profile_options
 def generate_command(
     url: str,
     service_name: str,
@@ -62,23 +196,89 @@ def generate_command(
     api_tags: str | None,
     templates_dir: str | None,
     output_dir: str | None,
+    incremental: bool,
+    jobs: int,
+    models_layout: ModelsLayout,
+    lazy_exports: bool,
+    model_backend: ModelBackend,
+    include_paths: str | None,
+    exclude_paths: str | None,
+    include_operations: str | None,
+    exclude_operations: str | None,
+    include_methods: str | None,
+    exclude_methods: str | None,
+    profile: bool,
+    profile_output: str | None,
+    profile_format: ProfileFormat,
 ) -> None:
-    parser = Parser.from_source(
-        openapi_spec=url,
-        package_name=service_name,
-        selected_tags=api_tags.split(",") if api_tags else None,
+    operation_filter = build_operation_filter(
+        include_paths, exclude_paths, include_operations, exclude_operations, include_methods, exclude_methods
     )
-    gen = RESTClientGenerator(
-        openapi_spec=parser,
-        async_mode=async_mode,
-        templates_dir=templates_dir,
-        base_path=output_dir,
-    )
-    gen.generate()
-    format_file(output_dir)
+    with maybe_profile(profile, profile_output, profile_format):
+        try:
+            parser = Parser.from_source(
+                openapi_spec=url,
+                package_name=service_name,
+                selected_tags=api_tags.split(",") if api_tags else None,
+                operation_filter=operation_filter or None,
+                model_backend=model_backend,
+            )
+        except OperationFilterError as exc:
+            raise click.UsageError(str(exc)) from exc
+        gen = RESTClientGenerator(
+            openapi_spec=parser,
+            async_mode=async_mode,
+            templates_dir=templates_dir,
+            base_path=output_dir,
+            incremental=incremental,
+            jobs=jobs,
+            models_layout=models_layout,
+            lazy_exports=lazy_exports,
+        )
+        gen.generate()
+        format_file(output_dir)
+
+
+@click.command("generate-all")
+@click.option(
+    "--config",
+    "-c",
+    "config_path",
+    required=False,
+    type=click.Path(exists=True, dir_okay=False),
+    help=f"Manifest listing the services to generate (default: ./{DEFAULT_BATCH_CONFIG})",
+    default=DEFAULT_BATCH_CONFIG,
+)
+@click.option(
+    "--jobs",
+    "-j",
+    required=False,
+    type=click.IntRange(min=1),
+    help="Number of services generated in parallel (default: number of CPUs)",
+    default=None,
+)
+@profile_options
+def generate_all_command(
+    config_path: str,
+    jobs: int | None,
+    profile: bool,
+    profile_output: str | None,
+    profile_format: ProfileFormat,
+) -> None:
+    try:
+        config = load_batch_config(config_path)
+    except BatchConfigError as exc:
+        raise click.BadParameter(str(exc), param_hint="--config") from exc
+
+    try:
+        with maybe_profile(profile, profile_output, profile_format):
+            generate_all(config, jobs=jobs)
+    except BatchGenerationError as exc:
+        raise click.ClickException(str(exc)) from exc
 
 
 cli.add_command(generate_command)
+cli.add_command(generate_all_command)
 
 if __name__ == "__main__":
     cli()
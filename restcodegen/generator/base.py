@@ -13,13 +13,21 @@ from restcodegen.generator.utils import (
 )
 
 
+def build_environment(templates_dir: Path) -> Environment:
+    env = Environment(loader=FileSystemLoader(templates_dir), autoescape=True)  # type: ignore
+    env.filters["to_snake_case"] = name_to_snake
+    env.filters["to_camel_case"] = snake_to_camel
+    env.filters["rename_python_builtins"] = rename_python_builtins
+    return env
+
+
 class BaseGenerator:
     BASE_PATH: Path
 
     def __init__(self) -> None:
         if not self.BASE_PATH.exists():
             LOGGER.debug("base directory does not exists, creating...")
-            self.BASE_PATH.mkdir(parents=True)
+            self.BASE_PATH.mkdir(parents=True, exist_ok=True)
 
         core_init_path = self.BASE_PATH / "__init__.py"
         if not core_init_path.exists():
@@ -40,7 +48,4 @@ class BaseTemplateGenerator(BaseGenerator):
         super().__init__()
         self.templates_dir = Path(templates_dir) if templates_dir is not None else TEMPLATES
         self.version = get_version()
-        self.env = Environment(loader=FileSystemLoader(self.templates_dir), autoescape=True)  # type: ignore
-        self.env.filters["to_snake_case"] = name_to_snake
-        self.env.filters["to_camel_case"] = snake_to_camel
-        self.env.filters["rename_python_builtins"] = rename_python_builtins
+        self.env = build_environment(self.templates_dir)
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from restcodegen.generator.codegen import RESTClientGenerator
+from restcodegen.generator.log import LOGGER
+from restcodegen.generator.models_layout import MODELS_LAYOUTS, ModelsLayout
+from restcodegen.generator.parser import MODEL_BACKENDS, ModelBackend, Parser
+from restcodegen.generator.profiling import detach_worker, stage
+from restcodegen.generator.spec.fetcher import AsyncSpecFetcher, FetchResult, PrefetchedSpecFetcher, SpecFetchError
+from restcodegen.generator.spec.loader import SpecLoader
+from restcodegen.generator.spec.pruner import OperationFilter
+from restcodegen.generator.utils import format_file, is_url, name_to_snake
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:  # pragma: no cover - Python 3.10
+    try:
+        import tomli as tomllib
+    except ModuleNotFoundError:
+        tomllib = None
+
+DEFAULT_BATCH_CONFIG = "restcodegen.toml"
+
+
+class BatchConfigError(ValueError):
+    """Raised when файл конфигурации пакетной генерации некорректен."""
+
+
+class BatchGenerationError(RuntimeError):
+    """Raised when генерация хотя бы одного сервиса завершилась ошибкой."""
+
+    def __init__(self, failures: dict[str, BaseException]) -> None:
+        self.failures = failures
+        details = "; ".join(f"{name}: {exc}" for name, exc in failures.items())
+        super().__init__(f"Generation failed for {len(failures)} service(s): {details}")
+
+
+@dataclass(slots=True)
+class ServiceConfig:
+    """Параметры генерации одного сервиса, совпадающие с опциями команды ``generate``."""
+
+    service_name: str
+    url: str
+    api_tags: list[str] | None = None
+    async_mode: bool = False
+    templates_dir: str | None = None
+    output_dir: str | None = None
+    incremental: bool = False
+    models_layout: ModelsLayout = "single"
+    lazy_exports: bool = False
+    model_backend: ModelBackend = "pydantic"
+    include_paths: list[str] = field(default_factory=list)
+    exclude_paths: list[str] = field(default_factory=list)
+    include_operations: list[str] = field(default_factory=list)
+    exclude_operations: list[str] = field(default_factory=list)
+    include_methods: list[str] = field(default_factory=list)
+    exclude_methods: list[str] = field(default_factory=list)
+
+    @property
+    def operation_filter(self) -> OperationFilter:
+        return OperationFilter(
+            include_paths=tuple(self.include_paths),
+            exclude_paths=tuple(self.exclude_paths),
+            include_operation_ids=tuple(self.include_operations),
+            exclude_operation_ids=tuple(self.exclude_operations),
+            include_methods=tuple(self.include_methods),
+            exclude_methods=tuple(self.exclude_methods),
+        )
+
+
+@dataclass(slots=True)
+class BatchConfig:
+    services: list[ServiceConfig] = field(default_factory=list)
+
+    @property
+    def output_dirs(self) -> list[str | None]:
+        return list(dict.fromkeys(service.output_dir for service in self.services))
+
+
+# Ключи TOML -> поля ServiceConfig. Имена повторяют длинные опции CLI.
+CONFIG_KEYS = {
+    "name": "service_name",
+    "service-name": "service_name",
+    "url": "url",
+    "api-tags": "api_tags",
+    "tags": "api_tags",
+    "async": "async_mode",
+    "templates-dir": "templates_dir",
+    "output-dir": "output_dir",
+    "incremental": "incremental",
+    "models-layout": "models_layout",
+    "lazy-exports": "lazy_exports",
+    "model-backend": "model_backend",
+    "include-paths": "include_paths",
+    "exclude-paths": "exclude_paths",
+    "include-operations": "include_operations",
+    "exclude-operations": "exclude_operations",
+    "include-methods": "include_methods",
+    "exclude-methods": "exclude_methods",
+}
+LIST_FIELDS = {
+    "api_tags",
+    "include_paths",
+    "exclude_paths",
+    "include_operations",
+    "exclude_operations",
+    "include_methods",
+    "exclude_methods",
+}
+
+
+def load_batch_config(path: str | Path) -> BatchConfig:
+    """Reads a manifest with a ``[defaults]`` table and one ``[[services]]`` table per service.
+
+    Relative paths are resolved against the current directory, as for the ``generate`` command.
+    """
+    if tomllib is None:  # pragma: no cover - Python 3.10 without tomli
+        raise BatchConfigError("Reading restcodegen.toml on Python 3.10 requires the 'tomli' package")
+
+    try:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    except tomllib.TOMLDecodeError as exc:
+        raise BatchConfigError(f"Invalid TOML in {path}: {exc}") from exc
+
+    defaults = _service_options(data.get("defaults", {}), "defaults")
+    services = data.get("services")
+    if not isinstance(services, list) or not services:
+        raise BatchConfigError(f"{path} must define at least one [[services]] table")
+
+    config = BatchConfig()
+    for index, raw_service in enumerate(services):
+        options = {**defaults, **_service_options(raw_service, f"services[{index}]")}
+        missing = [key for key in ("service_name", "url") if not options.get(key)]
+        if missing:
+            raise BatchConfigError(f"services[{index}] is missing required keys: {', '.join(missing)}")
+        if options.get("models_layout", "single") not in MODELS_LAYOUTS:
+            raise BatchConfigError(f"services[{index}] has unknown models-layout {options['models_layout']!r}")
+        if options.get("model_backend", "pydantic") not in MODEL_BACKENDS:
+            raise BatchConfigError(f"services[{index}] has unknown model-backend {options['model_backend']!r}")
+        config.services.append(ServiceConfig(**options))
+
+    _check_unique_targets(config)
+    return config
+
+
+def _service_options(raw: Any, location: str) -> dict[str, Any]:
+    if not isinstance(raw, dict):
+        raise BatchConfigError(f"{location} must be a table")
+
+    options: dict[str, Any] = {}
+    for key, value in raw.items():
+        field_name = CONFIG_KEYS.get(key.replace("_", "-"))
+        if field_name is None:
+            raise BatchConfigError(f"Unknown key {key!r} in {location}")
+        if field_name in LIST_FIELDS and isinstance(value, str):
+            value = value.split(",")
+        options[field_name] = value
+    return options
+
+
+def _check_unique_targets(config: BatchConfig) -> None:
+    seen: set[tuple[str | None, str]] = set()
+    for service in config.services:
+        target = (service.output_dir, name_to_snake(service.service_name))
+        if target in seen:
+            raise BatchConfigError(f"Service {service.service_name!r} is generated into the same package twice")
+        seen.add(target)
+
+
+def prefetch_specs(services: list[ServiceConfig]) -> dict[str, FetchResult | SpecFetchError]:
+    """Downloads every remote spec concurrently over one pooled client, keyed by service name."""
+    remote = [service for service in services if is_url(service.url)]
+    if not remote:
+        return {}
+
+    requests = [(service.url, SpecLoader(service.url, service.service_name).stored_validators()) for service in remote]
+
+    async def fetch() -> list[FetchResult | SpecFetchError]:
+        async with AsyncSpecFetcher() as fetcher:
+            return await fetcher.fetch_many(requests)
+
+    with stage("fetch.prefetch", count=len(requests)):
+        results = asyncio.run(fetch())
+    return {service.service_name: result for service, result in zip(remote, results)}
+
+
+def generate_service(service: ServiceConfig, prefetched: FetchResult | SpecFetchError | None = None) -> str:
+    """Fetches, parses and renders one service. Runs in a worker process during batch generation."""
+    loader = None
+    if prefetched is not None:
+        fetcher = PrefetchedSpecFetcher({service.url: prefetched})
+        loader = SpecLoader(service.url, service.service_name, fetcher=fetcher)
+    parser = Parser.from_source(
+        openapi_spec=service.url,
+        package_name=service.service_name,
+        selected_tags=service.api_tags,
+        loader=loader,
+        operation_filter=service.operation_filter,
+        model_backend=service.model_backend,
+    )
+    RESTClientGenerator(
+        openapi_spec=parser,
+        async_mode=service.async_mode,
+        templates_dir=service.templates_dir,
+        base_path=service.output_dir,
+        incremental=service.incremental,
+        models_layout=service.models_layout,
+        lazy_exports=service.lazy_exports,
+    ).generate()
+    return service.service_name
+
+
+def generate_all(
+    config: BatchConfig, jobs: int | None = None, *, prefetch: bool = True, format_output: bool = True
+) -> None:
+    """Generates every service across a process pool, then formats each output directory once.
+
+    With ``prefetch`` remote specs are downloaded concurrently before the pool starts.
+    """
+    workers = min(jobs or os.cpu_count() or 1, len(config.services))
+    failures: dict[str, BaseException] = {}
+    prefetched = prefetch_specs(config.services) if prefetch else {}
+
+    if workers <= 1:
+        for service in config.services:
+            try:
+                with stage("service", service=service.service_name):
+                    generate_service(service, prefetched.get(service.service_name))
+            except Exception as exc:
+                LOGGER.error("Generation failed for service %s: %s", service.service_name, exc)
+                failures[service.service_name] = exc
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=detach_worker) as executor, stage("services"):
+            futures: dict[str, Future[str]] = {
+                service.service_name: executor.submit(generate_service, service, prefetched.get(service.service_name))
+                for service in config.services
+            }
+            for name, future in futures.items():
+                error = future.exception()
+                if error is not None:
+                    LOGGER.error("Generation failed for service %s: %s", name, error)
+                    failures[name] = error
+
+    if format_output:
+        for output_dir in config.output_dirs:
+            format_file(output_dir)
+
+    if failures:
+        raise BatchGenerationError(failures)
@@ -1,18 +1,91 @@
-import json
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
 from functools import cached_property
 from pathlib import Path
+from typing import Any
 
-from datamodel_code_generator import DataModelType, generate
+from jinja2 import Environment
 
-from restcodegen.generator.base import BaseTemplateGenerator
+from restcodegen.generator.base import BaseTemplateGenerator, build_environment
 from restcodegen.generator.log import LOGGER
+from restcodegen.generator.manifest import MANIFEST_FILE_NAME, GenerationManifest, file_fingerprint, fingerprint
+from restcodegen.generator.models_layout import (
+    SINGLE_MODULE,
+    ModelsLayout,
+    SplitModels,
+    model_imports,
+    render_facade,
+    split_models,
+)
 from restcodegen.generator.parser import Parser
+from restcodegen.generator.profiling import detach_worker, stage
 from restcodegen.generator.utils import (
     create_and_write_file,
     name_to_snake,
 )
 
 
+class ClientRenderer:
+    """Renders one API module per tag; picklable so it can be shipped to worker processes."""
+
+    def __init__(
+        self,
+        openapi_spec: Parser,
+        templates_dir: Path,
+        *,
+        async_mode: bool,
+        version: str,
+        base_import: str,
+        model_locations: Mapping[str, str] | None = None,
+    ) -> None:
+        self.openapi_spec = openapi_spec
+        self.templates_dir = templates_dir
+        self.async_mode = async_mode
+        self.version = version
+        self.base_import = base_import
+        self.model_locations = model_locations
+
+    @cached_property
+    def env(self) -> Environment:
+        return build_environment(self.templates_dir)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop("env", None)
+        return state
+
+    def render(self, tag: str) -> str:
+        with stage("render.api", tag=tag):
+            operations = self.openapi_spec.handlers_by_tag(tag)
+            operation_contexts = [self.openapi_spec.get_operation_context(operation) for operation in operations]
+            models = self.openapi_spec.models_by_tag(tag)
+            return self.env.get_template("api_client.jinja2").render(
+                async_mode=self.async_mode,
+                model_backend=self.openapi_spec.model_backend,
+                models=sorted(models),
+                model_imports=model_imports(models, self.model_locations),
+                operations=operation_contexts,
+                api_name=tag,
+                service_name=self.openapi_spec.service_name,
+                version=self.version,
+                base_import=self.base_import,
+            )
+
+
+_WORKER_RENDERER: ClientRenderer | None = None
+
+
+def _init_render_worker(renderer: ClientRenderer) -> None:
+    global _WORKER_RENDERER
+    detach_worker()
+    _WORKER_RENDERER = renderer
+
+
+def _render_in_worker(tag: str) -> str:
+    assert _WORKER_RENDERER is not None
+    return _WORKER_RENDERER.render(tag)
+
+
 class RESTClientGenerator(BaseTemplateGenerator):
     BASE_PATH = Path(".") / "clients" / "http"
 
@@ -22,11 +95,20 @@ class RESTClientGenerator(BaseTemplateGenerator):
         templates_dir: str | None = None,
         async_mode: bool = False,
         base_path: str | Path | None = None,
+        incremental: bool = False,
+        jobs: int = 1,
+        models_layout: ModelsLayout = "single",
+        lazy_exports: bool = False,
     ) -> None:
         super().__init__(templates_dir=templates_dir)
         self.openapi_spec = openapi_spec
         self.async_mode = async_mode
         self.base_path = Path(base_path) if base_path is not None else self.BASE_PATH
+        self.incremental = incremental
+        self.jobs = max(jobs, 1)
+        self.models_layout = models_layout
+        self.lazy_exports = lazy_exports
+        self._manifest = GenerationManifest(self._service_path / MANIFEST_FILE_NAME) if incremental else None
 
     @cached_property
     def _base_import(self) -> str:
@@ -38,58 +120,157 @@ class RESTClientGenerator(BaseTemplateGenerator):
                 pass
         return ".".join(list(base.parts))
 
+    @property
+    def _service_path(self) -> Path:
+        return self.base_path / name_to_snake(self.openapi_spec.service_name)
+
+    @cached_property
+    def _environment_fingerprint(self) -> str:
+        """Hash of everything that affects every generated file: version, templates and options."""
+        templates = {
+            template.name: file_fingerprint(template) for template in sorted(self.templates_dir.glob("*.jinja2"))
+        }
+        options = {
+            "async_mode": self.async_mode,
+            "base_import": self._base_import,
+            "service_name": self.openapi_spec.service_name,
+            "models_layout": self.models_layout,
+            "lazy_exports": self.lazy_exports,
+            "model_backend": self.openapi_spec.model_backend,
+        }
+        return fingerprint(self.version, templates, options)
+
+    @property
+    def _models_package(self) -> str:
+        return f"{self._base_import}.{name_to_snake(self.openapi_spec.service_name)}.models"
+
+    @cached_property
+    def _split_models(self) -> SplitModels | None:
+        if self.models_layout == "single" or not self.openapi_spec.models_source:
+            return None
+        with stage("render.models"):
+            models_by_tag = {tag: self.openapi_spec.models_by_tag(tag) for tag in self.openapi_spec.apis}
+            return split_models(self.openapi_spec.models_source, models_by_tag, self._models_package)
+
+    @property
+    def _model_locations(self) -> dict[str, str] | None:
+        return self._split_models.locations if self._split_models is not None else None
+
+    def _is_fresh(self, key: str, digest: str, *outputs: Path) -> bool:
+        if self._manifest is not None and self._manifest.is_fresh(key, digest, *outputs):
+            LOGGER.info(f"Skip {key}: inputs unchanged")
+            return True
+        return False
+
+    def _tag_fingerprint(self, tag: str) -> str:
+        spec = self.openapi_spec.openapi_spec
+        components = {key: value for key, value in spec.get("components", {}).items() if key != "schemas"}
+        operations = [
+            {"path": operation.path, "method": operation.method, "operation": operation.raw_operation}
+            for operation in self.openapi_spec.handlers_by_tag(tag)
+        ]
+        return fingerprint(self._environment_fingerprint, tag, operations, components, self._model_locations)
+
+    def _init_fingerprint(self) -> str:
+        return fingerprint(self._environment_fingerprint, sorted(self.openapi_spec.apis))
+
+    def _models_fingerprint(self) -> str:
+        spec = {key: value for key, value in self.openapi_spec.openapi_spec.items() if key != "paths"}
+        # Разбиение по тегам зависит от операций, поэтому без него смена тегов не перегенерирует модели.
+        return fingerprint(self._environment_fingerprint, spec, self._model_locations)
+
     def generate(self) -> None:
         self._gen_clients()
         self._gen_init_apis()
         self._gen_models()
+        if self._manifest is not None:
+            self._manifest.save()
 
     def _gen_init_apis(self) -> None:
+        file_path = self._service_path / "__init__.py"
+        if self.incremental and self._is_fresh("__init__", self._init_fingerprint(), file_path):
+            return
+
         LOGGER.info("Generate __init__.py for apis")
-        rendered_code = self.env.get_template("apis_init.jinja2").render(
-            api_names=self.openapi_spec.apis,
-            service_name=self.openapi_spec.service_name,
+        with stage("render.apis_init"):
+            rendered_code = self.env.get_template("apis_init.jinja2").render(
+                api_names=sorted(self.openapi_spec.apis),
+                service_name=self.openapi_spec.service_name,
+                version=self.version,
+                base_import=self._base_import,
+                lazy_exports=self.lazy_exports,
+            )
+        create_and_write_file(file_path=file_path, text=rendered_code)
+        create_and_write_file(file_path=file_path.parent.parent / "__init__.py", text="# coding: utf-8")
+
+    def _client_renderer(self) -> ClientRenderer:
+        return ClientRenderer(
+            self.openapi_spec,
+            self.templates_dir,
+            async_mode=self.async_mode,
             version=self.version,
             base_import=self._base_import,
+            model_locations=self._model_locations,
         )
-        file_name = f"{name_to_snake(self.openapi_spec.service_name)}/__init__.py"
-        file_path = self.base_path / file_name
-        create_and_write_file(file_path=file_path, text=rendered_code)
-        create_and_write_file(file_path=file_path.parent.parent / "__init__.py", text="# coding: utf-8")
+
+    def _render_clients(self, tags: list[str]) -> Iterator[str]:
+        renderer = self._client_renderer()
+        if self.jobs == 1 or len(tags) < 2:
+            yield from map(renderer.render, tags)
+            return
+
+        workers = min(self.jobs, len(tags))
+        chunksize = max(len(tags) // (workers * 4), 1)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_render_worker, initargs=(renderer,)
+        ) as executor:
+            yield from executor.map(_render_in_worker, tags, chunksize=chunksize)
 
     def _gen_clients(self) -> None:
-        for tag in self.openapi_spec.apis:
+        tags: list[str] = []
+        for tag in sorted(self.openapi_spec.apis):
+            file_path = self._service_path / "apis" / f"{name_to_snake(tag)}_api.py"
+            if self.incremental and self._is_fresh(f"apis/{tag}", self._tag_fingerprint(tag), file_path):
+                continue
+            tags.append(tag)
+
+        for tag, rendered_code in zip(tags, self._render_clients(tags)):
             LOGGER.info(f"Generate REST client for tag: {tag}")
-            operations = self.openapi_spec.handlers_by_tag(tag)
-            operation_contexts = [self.openapi_spec.get_operation_context(operation) for operation in operations]
-            models = self.openapi_spec.models_by_tag(tag)
-            rendered_code = self.env.get_template("api_client.jinja2").render(
-                async_mode=self.async_mode,
-                models=models,
-                operations=operation_contexts,
-                api_name=tag,
-                service_name=self.openapi_spec.service_name,
-                version=self.version,
-                base_import=self._base_import,
-            )
-            file_name = f"{name_to_snake(tag)}_api.py"
-            file_path = self.base_path / name_to_snake(self.openapi_spec.service_name) / "apis" / file_name
+            file_path = self._service_path / "apis" / f"{name_to_snake(tag)}_api.py"
             create_and_write_file(file_path=file_path, text=rendered_code)
             create_and_write_file(file_path=file_path.parent / "__init__.py", text="# coding: utf-8")
 
+    @cached_property
+    def _models_files(self) -> dict[str, str]:
+        """Module name -> body. The ``tag`` layout keeps ``api_models`` as a lazy re-export of every model."""
+        if self._split_models is None:
+            return {SINGLE_MODULE: self.openapi_spec.models_source}
+        return {**self._split_models.modules, SINGLE_MODULE: render_facade(self._split_models.locations)}
+
     def _gen_models(self) -> None:
+        models_dir = self._service_path / "models"
+        if self.incremental:
+            outputs = [models_dir / f"{module}.py" for module in self._models_files]
+            if self._is_fresh("models", self._models_fingerprint(), *outputs):
+                return
+
         LOGGER.info(f"Generate models for service: {self.openapi_spec.service_name}")
-        file_path = self.base_path / name_to_snake(self.openapi_spec.service_name) / "models" / "api_models.py"
-        create_and_write_file(file_path=file_path)
-        create_and_write_file(file_path=file_path.parent / "__init__.py", text="# coding: utf-8")
-        header_path_template = self.templates_dir / "header.jinja2"
-        generate(
-            json.dumps(self.openapi_spec.openapi_spec),
-            output=file_path,
-            snake_case_field=True,
-            output_model_type=DataModelType.PydanticV2BaseModel,
-            reuse_model=False,
-            field_constraints=True,
-            custom_file_header_path=header_path_template,
-            capitalise_enum_members=True,
-            encoding="utf-8",
-        )
+        header = (self.templates_dir / "header.jinja2").read_text(encoding="utf-8")
+        for module, body in self._models_files.items():
+            create_and_write_file(file_path=models_dir / f"{module}.py", text=self._models_file_text(header, body))
+        create_and_write_file(file_path=models_dir / "__init__.py", text="# coding: utf-8")
+        self._remove_stale_models(models_dir)
+
+    def _remove_stale_models(self, models_dir: Path) -> None:
+        """Drops model modules left from a previous split, e.g. of a tag that no longer owns any model."""
+        for path in models_dir.glob("*_models*.py"):
+            if path.stem not in self._models_files:
+                LOGGER.info(f"Remove stale models module: {path}")
+                path.unlink()
+
+    @staticmethod
+    def _models_file_text(header: str, body: str) -> str:
+        text = f"{header}\n"
+        if body:
+            text += f"\n{body.rstrip()}\n"
+        return text
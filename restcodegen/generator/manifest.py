@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from restcodegen.generator.log import LOGGER
+
+MANIFEST_FILE_NAME = ".restcodegen-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable content hash of JSON-compatible values."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class GenerationManifest:
+    """Хранит хэши входных данных для каждого сгенерированного артефакта."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._previous = self._read()
+        self._current: dict[str, str] = {}
+
+    def _read(self) -> dict[str, str]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Unable to read manifest %s: %s", self.path, exc)
+            return {}
+
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return {}
+        entries = data.get("entries", {})
+        return entries if isinstance(entries, dict) else {}
+
+    def is_fresh(self, key: str, digest: str, *outputs: Path) -> bool:
+        """Registers ``digest`` for ``key`` and reports whether the previous run produced the same one."""
+        self._current[key] = digest
+        return self._previous.get(key) == digest and all(output.exists() for output in outputs)
+
+    def save(self) -> None:
+        payload = {"version": MANIFEST_VERSION, "entries": dict(sorted(self._current.items()))}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(payload, indent=4), encoding="utf-8")
+        except OSError as exc:
+            LOGGER.warning("Unable to write manifest %s: %s", self.path, exc)
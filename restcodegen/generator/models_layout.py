@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import ast
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Literal
+
+from restcodegen.generator.utils import name_to_snake
+
+ModelsLayout = Literal["single", "tag"]
+
+MODELS_LAYOUTS: tuple[ModelsLayout, ...] = ("single", "tag")
+SINGLE_MODULE = "api_models"
+COMMON_MODULE = "common_models"
+
+
+@dataclass(slots=True)
+class _Definition:
+    name: str
+    source: str
+    dependencies: set[str]
+
+
+@dataclass(slots=True)
+class SplitModels:
+    """Результат разбиения ``api_models.py``: исходный код модулей и модуль каждой модели."""
+
+    modules: dict[str, str] = field(default_factory=dict)
+    locations: dict[str, str] = field(default_factory=dict)
+
+
+def model_imports(names: Iterable[str], locations: Mapping[str, str] | None = None) -> list[tuple[str, list[str]]]:
+    """Groups ``names`` by defining module; without ``locations`` everything comes from ``api_models``.
+
+    Names missing from ``locations`` are looked up in the common module.
+    """
+    ordered = sorted(names)
+    if locations is None:
+        return [(SINGLE_MODULE, ordered)] if ordered else []
+    grouped: dict[str, list[str]] = {}
+    for name in ordered:
+        grouped.setdefault(locations.get(name, COMMON_MODULE), []).append(name)
+    return sorted(grouped.items())
+
+
+def tag_module_name(tag: str) -> str:
+    """``common_models`` and the ``api_models`` facade are reserved, so such tags get a ``_tag`` suffix."""
+    module = f"{name_to_snake(tag)}_models"
+    return f"{module}_tag" if module in (COMMON_MODULE, SINGLE_MODULE) else module
+
+
+def _names(nodes: Iterable[ast.AST]) -> set[str]:
+    return {node.id for root in nodes for node in ast.walk(root) if isinstance(node, ast.Name)}
+
+
+def _segment(lines: list[str], node: ast.stmt) -> str:
+    start = min([node.lineno, *(decorator.lineno for decorator in getattr(node, "decorator_list", []))])
+    return "".join(lines[start - 1 : node.end_lineno])
+
+
+def split_models(source: str, models_by_tag: Mapping[str, Iterable[str]], models_package: str) -> SplitModels:
+    """Splits datamodel-code-generator output into one module per tag plus a module of shared models.
+
+    A model goes to a tag module when only that tag's operations reach it, directly or through other
+    models; everything else (shared or unused models) goes to ``common_models``. Shared models never
+    depend on tag models, so modules import each other without cycles.
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+
+    imports: list[ast.Import | ast.ImportFrom] = []
+    definitions: dict[str, _Definition] = {}
+    trailing: list[ast.stmt] = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            imports.append(node)
+        elif isinstance(node, ast.ClassDef):
+            definitions[node.name] = _Definition(node.name, _segment(lines, node), _names([node]) - {node.name})
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)) and all(
+            isinstance(target, ast.Name) for target in _targets(node)
+        ):
+            for target in _targets(node):
+                assert isinstance(target, ast.Name)
+                definitions[target.id] = _Definition(target.id, _segment(lines, node), _names([node]) - {target.id})
+        else:
+            trailing.append(node)
+
+    for definition in definitions.values():
+        definition.dependencies &= definitions.keys()
+
+    owners: dict[str, set[str]] = {name: set() for name in definitions}
+    for tag, models in models_by_tag.items():
+        for name in _closure(definitions, (model for model in models if model in definitions)):
+            owners[name].add(tag)
+
+    shared = _closure(definitions, (name for name, tags in owners.items() if len(tags) != 1))
+    # Служебные вызовы (``Model.model_rebuild()``) должны видеть все упомянутые модели.
+    for node in trailing:
+        referenced = _names([node]) & definitions.keys()
+        if len({next(iter(owners[name])) for name in referenced - shared}) > 1:
+            shared |= _closure(definitions, referenced)
+
+    locations = {
+        name: COMMON_MODULE if name in shared else tag_module_name(next(iter(owners[name]))) for name in definitions
+    }
+
+    bodies: dict[str, list[str]] = {}
+    for name, definition in definitions.items():
+        bodies.setdefault(locations[name], []).append(definition.source)
+    for node in trailing:
+        referenced_modules = {locations[name] for name in _names([node]) & definitions.keys()}
+        tag_modules = referenced_modules - {COMMON_MODULE}
+        module = next(iter(tag_modules)) if tag_modules else COMMON_MODULE
+        bodies.setdefault(module, []).append(_segment(lines, node))
+
+    result = SplitModels(locations=locations)
+    for module, chunks in bodies.items():
+        body = "\n\n".join(chunk.rstrip() + "\n" for chunk in chunks)
+        used = _names([ast.parse(body)])
+        local = {name for name, location in locations.items() if location == module}
+        groups = _filtered_imports(imports, used)
+        foreign = sorted(name for name in used & definitions.keys() if name not in local)
+        if foreign:
+            groups.append([f"from {models_package}.{COMMON_MODULE} import {', '.join(foreign)}"])
+        header = "\n\n".join("\n".join(group) for group in groups if group)
+        result.modules[module] = f"{header}\n\n\n{body}"
+    return result
+
+
+def _targets(node: ast.Assign | ast.AnnAssign) -> list[ast.expr]:
+    return node.targets if isinstance(node, ast.Assign) else [node.target]
+
+
+def _closure(definitions: Mapping[str, _Definition], roots: Iterable[str]) -> set[str]:
+    seen: set[str] = set()
+    stack = list(roots)
+    while stack:
+        name = stack.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        stack.extend(definitions[name].dependencies - seen)
+    return seen
+
+
+def _filtered_imports(imports: list[ast.Import | ast.ImportFrom], used: set[str]) -> list[list[str]]:
+    """``from __future__`` and the imports the module body refers to, as two blocks."""
+    future: list[str] = []
+    regular: list[str] = []
+    for node in imports:
+        if isinstance(node, ast.ImportFrom) and node.module == "__future__":
+            future.append(ast.unparse(node))
+            continue
+        aliases = [alias for alias in node.names if (alias.asname or alias.name).split(".")[0] in used]
+        if not aliases:
+            continue
+        if isinstance(node, ast.ImportFrom):
+            regular.append(ast.unparse(ast.ImportFrom(node.module, aliases, node.level)))
+        else:
+            regular.append(ast.unparse(ast.Import(aliases)))
+    return [future, regular]
+
+
+def render_facade(locations: Mapping[str, str]) -> str:
+    """``api_models`` that re-exports every model lazily (PEP 562), importing only the owning module."""
+    entries = "".join(f"    {name!r}: {module!r},\n" for name, module in sorted(locations.items()))
+    return (
+        "import importlib\n"
+        "from typing import Any\n"
+        "\n"
+        f"_MODULES = {{\n{entries}}}\n"
+        "\n"
+        "__all__ = sorted(_MODULES)\n"
+        "\n"
+        "\n"
+        "def __getattr__(name: str) -> Any:\n"
+        "    module = _MODULES.get(name)\n"
+        "    if module is None:\n"
+        '        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")\n'
+        '    value = getattr(importlib.import_module(f"{__package__}.{module}"), name)\n'
+        "    globals()[name] = value\n"
+        "    return value\n"
+        "\n"
+        "\n"
+        "def __dir__() -> list[str]:\n"
+        "    return __all__\n"
+    )
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import copy
 import json
-import tempfile
+from collections import defaultdict
 from dataclasses import dataclass
+from functools import cached_property
 import re
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Literal
 
-from datamodel_code_generator import OpenAPIScope, PythonVersion
+from datamodel_code_generator import DataModelType
+from datamodel_code_generator.format import PythonVersionMin
+from datamodel_code_generator.model import get_data_model_types
+from datamodel_code_generator.model.base import ALL_MODEL
 from datamodel_code_generator.parser.openapi import (
     OpenAPIParser,
     Operation,
@@ -18,13 +23,35 @@ from datamodel_code_generator.parser.openapi import (
 )
 
 from restcodegen.generator.log import LOGGER
+from restcodegen.generator.profiling import stage
 from restcodegen.generator.utils import name_to_snake, rename_python_builtins, snake_to_camel
 from pydantic import BaseModel, ConfigDict
 from restcodegen.generator.spec.loader import SpecLoader
+from restcodegen.generator.spec.pruner import OperationFilter, SpecPruner
 
 
 OPERATION_NAMES: set[str] = {"get", "put", "post", "delete", "patch", "head", "options", "trace"}
 
+MODEL_GENERATION_OPTIONS: dict[str, Any] = {
+    "snake_case_field": True,
+    "reuse_model": False,
+    "field_constraints": True,
+    "capitalise_enum_members": True,
+    "encoding": "utf-8",
+}
+
+ModelBackend = Literal["pydantic", "msgspec"]
+
+MODEL_BACKENDS: dict[ModelBackend, DataModelType] = {
+    "pydantic": DataModelType.PydanticV2BaseModel,
+    "msgspec": DataModelType.MsgspecStruct,
+}
+
+# Per-model template data. msgspec has no per-call exclude_none, so structs skip default values when encoding.
+MODEL_TEMPLATE_DATA: dict[ModelBackend, dict[str, Any]] = {
+    "msgspec": {"base_class_kwargs": {"omit_defaults": "True"}},
+}
+
 TYPE_MAP = {
     "integer": "int",
     "number": "float",
@@ -60,6 +87,7 @@ class OperationContext(BaseModel):
     request_body_model: str | None
     responses: dict[str, str]
     success_response: str | None
+    empty_success: bool = False
 
     def get(self, key: str, default: Any = None) -> Any:
         return getattr(self, key, default)
@@ -73,10 +101,12 @@ class Parser:
         openapi_spec: dict[str, Any],
         service_name: str,
         selected_tags: list[str] | None = None,
+        model_backend: ModelBackend = "pydantic",
     ) -> None:
         self.openapi_spec = openapi_spec
         self._raw_spec = openapi_spec
         self._service_name = service_name
+        self.model_backend: ModelBackend = model_backend
         self.version: str = ""
         self.description: str = ""
         self.openapi_version: str = ""
@@ -84,7 +114,12 @@ class Parser:
         self.all_tags: set[str] = set()
         self.request_model_names: set[str] = set()
         self.response_model_names: set[str] = set()
+        self.models_source: str = ""
         self._operations: list[ParsedOperation] | None = None
+        self._operations_by_tag: dict[str, list[ParsedOperation]] = {}
+        self._operations_by_method: dict[str, list[ParsedOperation]] = {}
+        self._operations_by_path: dict[str, list[ParsedOperation]] = {}
+        self._models_by_tag: dict[str, set[str]] = {}
         self.parse()
 
     @classmethod
@@ -95,10 +130,50 @@ class Parser:
         *,
         selected_tags: list[str] | None = None,
         loader: SpecLoader | None = None,
+        prune: bool = True,
+        operation_filter: OperationFilter | None = None,
+        model_backend: ModelBackend = "pydantic",
     ) -> "Parser":
-        spec_loader = loader or SpecLoader(openapi_spec, package_name)
+        """Operations outside ``selected_tags`` and ``operation_filter`` are dropped before normalization together
+        with the components only they reach, so they are neither parsed nor turned into models.
+
+        ``prune=False`` keeps the whole spec; tags then only limit the generated API modules. Operation filters
+        work only by pruning, so they cannot be combined with ``prune=False``.
+        """
+        if not prune and operation_filter:
+            raise ValueError("operation_filter requires prune=True")
+        pruner = None
+        if prune and (selected_tags or operation_filter):
+            pruner = SpecPruner(selected_tags or (), operation_filter)
+        if loader is None:
+            spec_loader = SpecLoader(openapi_spec, package_name, pruner=pruner)
+        else:
+            # Загрузчик, переданный снаружи (например, с заранее скачанной спецификацией), режется так же.
+            spec_loader = loader
+            if pruner is not None:
+                spec_loader.pruner = pruner
         spec = spec_loader.open()
-        return cls(spec, package_name, selected_tags=selected_tags)
+        artifact = cls._cache_artifact_name(model_backend)
+        state = spec_loader.cached_artifact(artifact)
+        if state is not None:
+            return cls._from_state(state, package_name, selected_tags)
+
+        parser = cls(spec, package_name, selected_tags=selected_tags, model_backend=model_backend)
+        spec_loader.store_artifact(artifact, parser.__getstate__())
+        return parser
+
+    @classmethod
+    def _cache_artifact_name(cls, model_backend: ModelBackend = "pydantic") -> str:
+        return f"parser:{cls.__module__}.{cls.__qualname__}:{model_backend}"
+
+    @classmethod
+    def _from_state(cls, state: dict[str, Any], service_name: str, selected_tags: list[str] | None) -> "Parser":
+        """Restores a parser from cached state, skipping model generation and operation resolution."""
+        parser = cls.__new__(cls)
+        parser.__dict__.update(state)
+        parser._service_name = service_name
+        parser._selected_tags = set(selected_tags) if selected_tags else set()
+        return parser
 
     @property
     def apis(self) -> set[str]:
@@ -118,6 +193,16 @@ class Parser:
     def service_name(self) -> str:
         return self._service_name
 
+    @cached_property
+    def spec_text(self) -> str:
+        """The spec serialized once and shared by every consumer that needs it as text."""
+        return json.dumps(self._raw_spec)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop("spec_text", None)
+        return state
+
     def parse(self) -> list[ParsedOperation]:
         info = self.openapi_spec.get("info", {})
         self.version = info.get("version", "1.0.0")
@@ -130,14 +215,14 @@ class Parser:
                 "Пожалуйста, обновите спецификацию перед генерацией."
             )
 
-        parser = self._init_openapi_parser()
-        operations = self._collect_operations(parser)
-        tags, request_models, response_models = self._collect_metadata(operations)
-
+        with stage("parse.init"):
+            parser = self._init_openapi_parser()
+        with stage("parse.models"):
+            self.models_source = self._generate_models_source(parser)
+        with stage("parse.operations"):
+            operations = self._collect_operations(parser)
+            self._build_indexes(operations)
         self._operations = operations
-        self.all_tags = tags
-        self.request_model_names = request_models
-        self.response_model_names = response_models
         return operations
 
     @property
@@ -167,17 +252,17 @@ class Parser:
             request_body_model=request_body_model,
             responses=responses,
             success_response=success_response,
+            empty_success=self._has_empty_success(operation.responses),
         )
 
     def handlers_by_tag(self, tag: str) -> list[ParsedOperation]:
-        return [operation for operation in self.operations if tag in (operation.operation.tags or [])]
+        return list(self._operations_by_tag.get(tag, []))
 
     def handlers_by_method(self, method: str) -> list[ParsedOperation]:
-        return [operation for operation in self.operations if operation.method.lower() == method.lower()]
+        return list(self._operations_by_method.get(method.lower(), []))
 
     def handler_by_path(self, path: str) -> list[ParsedOperation]:
-        normalized = self._normalize_path(path)
-        return [operation for operation in self.operations if self._normalize_path(operation.path) == normalized]
+        return list(self._operations_by_path.get(self._normalize_path(path), []))
 
     def request_models(self) -> set[str]:
         return set(self.request_model_names)
@@ -186,37 +271,31 @@ class Parser:
         return set(self.response_model_names)
 
     def models_by_tag(self, tag: str) -> set[str]:
-        models: set[str] = set()
-        for operation in self.operations:
-            if tag in (operation.operation.tags or []):
-                request_model = self._extract_request_body_model(operation)
-                if request_model:
-                    models.add(request_model)
-                responses = self._extract_response_models(operation.responses)
-                models.update(responses.values())
-                for parameter in operation.parameters:
-                    param_type = self._extract_parameter_type(parameter)
-                    if self._is_complex_type(param_type):
-                        models.add(param_type)
-        return models
+        return set(self._models_by_tag.get(tag, set()))
 
     def _init_openapi_parser(self) -> OpenAPIParser:
-        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as tmp_file:
-            json.dump(self._raw_spec, tmp_file)
-            tmp_path = Path(tmp_file.name)
-
-        try:
-            parser = OpenAPIParser(
-                tmp_path,
-                target_python_version=PythonVersion.PY_310,
-                openapi_scopes=[OpenAPIScope.Schemas, OpenAPIScope.Paths],
-                include_path_parameters=True,
-            )
-            parser.parse()
-        finally:
-            tmp_path.unlink(missing_ok=True)
+        """Configures the parser exactly as the models generator does, so its single parse serves both."""
+        model_types = get_data_model_types(MODEL_BACKENDS[self.model_backend], PythonVersionMin)
+        template_data = MODEL_TEMPLATE_DATA.get(self.model_backend)
+        return OpenAPIParser(
+            self.spec_text,
+            data_model_type=model_types.data_model,
+            data_model_root_type=model_types.root_model,
+            data_model_field_type=model_types.field_model,
+            data_type_manager_type=model_types.data_type_manager,
+            dump_resolve_reference_action=model_types.dump_resolve_reference_action,
+            known_third_party=model_types.known_third_party,
+            target_python_version=PythonVersionMin,
+            extra_template_data=defaultdict(dict, {ALL_MODEL: copy.deepcopy(template_data)}) if template_data else None,
+            **MODEL_GENERATION_OPTIONS,
+        )
 
-        return parser
+    @staticmethod
+    def _generate_models_source(parser: OpenAPIParser) -> str:
+        result = parser.parse()
+        if not isinstance(result, str):
+            raise TypeError("Modular models output is not supported")
+        return result
 
     @staticmethod
     def _collect_operations(parser: OpenAPIParser) -> list[ParsedOperation]:
@@ -269,21 +348,44 @@ class Parser:
 
         return operations
 
-    def _collect_metadata(self, operations: list[ParsedOperation]) -> tuple[set[str], set[str], set[str]]:
-        tags: set[str] = set()
+    def _build_indexes(self, operations: list[ParsedOperation]) -> None:
+        """Builds tag, method, path and model lookups in one pass so per-tag queries don't rescan operations."""
+        by_tag: dict[str, list[ParsedOperation]] = {}
+        by_method: dict[str, list[ParsedOperation]] = {}
+        by_path: dict[str, list[ParsedOperation]] = {}
+        models_by_tag: dict[str, set[str]] = {}
         request_models: set[str] = set()
         response_models: set[str] = set()
 
         for operation in operations:
-            tags.update(operation.operation.tags or [])
+            operation_models: set[str] = set()
             request_body_model = self._extract_request_body_model(operation)
             if request_body_model:
                 request_models.add(request_body_model)
+                operation_models.add(request_body_model)
 
             responses = self._extract_response_models(operation.responses)
             response_models.update(responses.values())
-
-        return tags, request_models, response_models
+            operation_models.update(responses.values())
+
+            for parameter in operation.parameters:
+                param_type = self._extract_parameter_type(parameter)
+                if self._is_complex_type(param_type):
+                    operation_models.add(param_type)
+
+            for tag in dict.fromkeys(operation.operation.tags or []):
+                by_tag.setdefault(tag, []).append(operation)
+                models_by_tag.setdefault(tag, set()).update(operation_models)
+            by_method.setdefault(operation.method.lower(), []).append(operation)
+            by_path.setdefault(self._normalize_path(operation.path), []).append(operation)
+
+        self._operations_by_tag = by_tag
+        self._operations_by_method = by_method
+        self._operations_by_path = by_path
+        self._models_by_tag = models_by_tag
+        self.all_tags = set(by_tag)
+        self.request_model_names = request_models
+        self.response_model_names = response_models
 
     @staticmethod
     def _normalize_path(path: str) -> str:
@@ -425,6 +527,14 @@ class Parser:
                 return responses[status]
         return None
 
+    @staticmethod
+    def _has_empty_success(responses: dict[str, ResponseObject]) -> bool:
+        """True when some 2xx response (e.g. ``204 No Content``) declares no body."""
+        return any(
+            Parser._is_success_status(str(status_code)) and not response.content
+            for status_code, response in responses.items()
+        )
+
     @staticmethod
     def _is_success_status(status_code: str) -> bool:
         if status_code.lower() == "default":
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, Literal
+
+ProfileFormat = Literal["json", "chrome"]
+
+_ACTIVE: Profiler | None = None
+
+
+@dataclass(slots=True)
+class StageRecord:
+    name: str
+    start: float
+    duration: float
+    peak_memory: int | None
+    depth: int
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class StageSummary:
+    name: str
+    count: int = 0
+    total: float = 0.0
+    peak_memory: int | None = None
+
+
+@dataclass(slots=True)
+class _OpenStage:
+    name: str
+    start: float
+    args: dict[str, Any]
+    child_peak: int = 0
+
+
+class Profiler:
+    """Замеряет время и пиковую память этапов генерации.
+
+    Пиковая память считается через ``tracemalloc`` и включает пики вложенных этапов. Трассировка
+    памяти заметно замедляет генерацию, поэтому её можно отключить через ``trace_memory=False``.
+    Замеряется только текущий процесс: работа в дочерних процессах видна как один внешний этап.
+    """
+
+    def __init__(self, *, trace_memory: bool = True) -> None:
+        self.trace_memory = trace_memory
+        self.records: list[StageRecord] = []
+        self._stack: list[_OpenStage] = []
+        self._origin = time.perf_counter()
+        self._started_tracemalloc = False
+
+    def start(self) -> None:
+        self._origin = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop(self) -> None:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def stage(self, name: str, **args: Any) -> Iterator[None]:
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            self._fold_peak_into_parent()
+        opened = _OpenStage(name, time.perf_counter(), args)
+        self._stack.append(opened)
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._stack.pop()
+            peak = None
+            if tracing:
+                peak = max(tracemalloc.get_traced_memory()[1], opened.child_peak)
+                tracemalloc.reset_peak()
+                if self._stack:
+                    self._stack[-1].child_peak = max(self._stack[-1].child_peak, peak)
+            self.records.append(
+                StageRecord(name, opened.start - self._origin, end - opened.start, peak, len(self._stack), args)
+            )
+
+    def _fold_peak_into_parent(self) -> None:
+        # Пик родителя до начала дочернего этапа иначе потерялся бы при reset_peak().
+        if self._stack:
+            parent = self._stack[-1]
+            parent.child_peak = max(parent.child_peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+    def summary(self) -> list[StageSummary]:
+        summaries: dict[str, StageSummary] = {}
+        for record in self.records:
+            summary = summaries.setdefault(record.name, StageSummary(record.name))
+            summary.count += 1
+            summary.total += record.duration
+            if record.peak_memory is not None:
+                summary.peak_memory = max(summary.peak_memory or 0, record.peak_memory)
+        return sorted(summaries.values(), key=lambda item: item.total, reverse=True)
+
+    def format_table(self) -> str:
+        rows = [("stage", "calls", "total, ms", "peak memory, KiB")]
+        for item in self.summary():
+            peak = "-" if item.peak_memory is None else f"{item.peak_memory / 1024:.1f}"
+            rows.append((item.name, str(item.count), f"{item.total * 1000:.2f}", peak))
+        widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+        lines = [
+            "  ".join(
+                value.ljust(width) if column == 0 else value.rjust(width)
+                for column, (value, width) in enumerate(zip(row, widths))
+            )
+            for row in rows
+        ]
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        return "\n".join(lines)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "stages": [asdict(record) for record in self.records],
+            "summary": [asdict(item) for item in self.summary()],
+        }
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Trace Event Format, loadable in chrome://tracing and Perfetto."""
+        pid = os.getpid()
+        events = []
+        for record in sorted(self.records, key=lambda item: item.start):
+            args = dict(record.args)
+            if record.peak_memory is not None:
+                args["peak_memory"] = record.peak_memory
+            events.append(
+                {
+                    "name": record.name,
+                    "cat": "restcodegen",
+                    "ph": "X",
+                    "ts": round(record.start * 1_000_000),
+                    "dur": round(record.duration * 1_000_000),
+                    "pid": pid,
+                    "tid": 0,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str | Path, profile_format: ProfileFormat = "json") -> None:
+        payload = self.to_chrome_trace() if profile_format == "chrome" else self.to_json()
+        Path(path).write_text(json.dumps(payload, indent=4, default=str), encoding="utf-8")
+
+
+@contextmanager
+def profiling(profiler: Profiler | None = None) -> Iterator[Profiler]:
+    """Makes ``profiler`` the target of every ``stage()`` call inside the block."""
+    global _ACTIVE
+    active = profiler or Profiler()
+    previous = _ACTIVE
+    _ACTIVE = active
+    active.start()
+    try:
+        yield active
+    finally:
+        active.stop()
+        _ACTIVE = previous
+
+
+def detach_worker() -> None:
+    """Drops the profiler a forked worker process inherited from its parent."""
+    global _ACTIVE
+    if _ACTIVE is not None:
+        _ACTIVE.stop()
+        _ACTIVE = None
+
+
+def stage(name: str, **args: Any) -> ContextManager[None]:
+    """Times a pipeline stage when profiling is active; a no-op otherwise."""
+    if _ACTIVE is None:
+        return nullcontext()
+    return _ACTIVE.stage(name, **args)
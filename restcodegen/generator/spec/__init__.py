@@ -1,15 +1,36 @@
-from .fetcher import FetchSettings, SpecFetchError, SpecFetcher
+from .cache import SpecCache
+from .fetcher import (
+    AsyncSpecFetcher,
+    FetchResult,
+    FetchSettings,
+    PrefetchedSpecFetcher,
+    SpecFetchError,
+    SpecFetcher,
+    SpecValidators,
+)
 from .loader import SpecLoader
 from .normalizer import SpecNormalizer, SpecTransform
 from .patchers import ComponentSchemaPatcher, InlineSchemaExtractor
+from .pruner import OperationFilter, OperationFilterError, SpecPruner
+from .walker import SpecVisitor, walk_spec
 
 __all__ = [
+    "AsyncSpecFetcher",
+    "PrefetchedSpecFetcher",
+    "SpecCache",
+    "FetchResult",
+    "OperationFilter",
+    "OperationFilterError",
     "FetchSettings",
     "SpecFetchError",
     "SpecFetcher",
     "SpecLoader",
     "SpecNormalizer",
+    "SpecPruner",
     "SpecTransform",
+    "SpecValidators",
+    "SpecVisitor",
+    "walk_spec",
     "ComponentSchemaPatcher",
     "InlineSchemaExtractor",
 ]
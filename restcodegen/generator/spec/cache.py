@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import os
+import pickle
+import sys
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from restcodegen.generator.log import LOGGER
+
+CACHE_VERSION = 1
+CACHE_DEPENDENCIES = ("restcodegen", "datamodel-code-generator", "pydantic", "pyyaml")
+CACHE_DIR_ENV = "RESTCODEGEN_CACHE_DIR"
+
+
+def user_cache_dir() -> Path:
+    """Per-user cache root, overridable with ``RESTCODEGEN_CACHE_DIR``.
+
+    Pickled artifacts are never stored in the generated client tree: projects commit that tree,
+    and unpickling a file planted there would run arbitrary code.
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "restcodegen"
+
+
+def project_cache_dir(project_dir: Path) -> Path:
+    """Separates caches of projects that generate services with the same name."""
+    digest = hashlib.sha256(str(project_dir.resolve()).encode("utf-8")).hexdigest()[:16]
+    return user_cache_dir() / digest
+
+
+@cache
+def tool_versions() -> dict[str, str]:
+    """Versions of the packages whose behaviour is baked into cached artifacts."""
+    versions: dict[str, str] = {}
+    for name in CACHE_DEPENDENCIES:
+        try:
+            versions[name] = importlib.metadata.version(name)
+        except importlib.metadata.PackageNotFoundError:
+            versions[name] = "unknown"
+    return versions
+
+
+class SpecCache:
+    """Бинарный кэш артефактов, полученных из одной версии спецификации.
+
+    Хранит одну запись на сервис: ключ и словарь артефактов (нормализованная спецификация,
+    состояние парсера). Запись с другим ключом считается промахом и перезаписывается.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def load(self, key: str) -> dict[str, Any]:
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)  # noqa: S301 - файл лежит в пользовательском кэше, его пишет только генератор
+        except FileNotFoundError:
+            return {}
+        except Exception as exc:  # повреждённый кэш не должен ломать генерацию
+            LOGGER.warning("Unable to read spec cache %s: %s", self.path, exc)
+            return {}
+
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION or data.get("key") != key:
+            return {}
+        artifacts = data.get("artifacts")
+        return artifacts if isinstance(artifacts, dict) else {}
+
+    def store(self, key: str, artifacts: dict[str, Any]) -> None:
+        payload = {"version": CACHE_VERSION, "key": key, "artifacts": artifacts}
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        try:
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(self.path)
+        except (OSError, pickle.PicklingError) as exc:
+            LOGGER.warning("Unable to write spec cache %s: %s", self.path, exc)
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import hashlib
+import importlib.util
+from collections.abc import Iterable, Mapping
+from dataclasses import asdict, dataclass, fields
 from typing import Any
 
 import httpx
 
+from restcodegen.generator.log import LOGGER
+from restcodegen.generator.spec.source import load_spec
+
 
 class SpecFetchError(RuntimeError):
     """Raised when удалённую спецификацию не удалось получить."""
@@ -16,17 +23,188 @@ class FetchSettings:
     verify_ssl: bool = True
 
 
+@dataclass(slots=True)
+class SpecValidators:
+    """Валидаторы HTTP-кэша для ранее скачанной спецификации."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+
+    def request_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_dict(self) -> dict[str, str | None]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SpecValidators":
+        return cls(**{field.name: data.get(field.name) for field in fields(cls)})
+
+
+@dataclass(slots=True)
+class FetchResult:
+    """``content`` is ``None`` when the server answered 304 Not Modified."""
+
+    content: bytes | None
+    validators: SpecValidators
+
+    @property
+    def not_modified(self) -> bool:
+        return self.content is None
+
+
+def content_hash(content: bytes | memoryview) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _merge_validators(
+    response: httpx.Response, digest: str | None, previous: SpecValidators | None = None
+) -> SpecValidators:
+    # 304 может не повторять все валидаторы, поэтому недостающие берутся из предыдущего ответа.
+    return SpecValidators(
+        etag=response.headers.get("ETag") or (previous.etag if previous else None),
+        last_modified=response.headers.get("Last-Modified") or (previous.last_modified if previous else None),
+        content_hash=digest,
+    )
+
+
+def _build_result(response: httpx.Response, validators: SpecValidators | None) -> FetchResult:
+    if response.status_code == httpx.codes.NOT_MODIFIED and validators is not None:
+        return FetchResult(None, _merge_validators(response, validators.content_hash, validators))
+    response.raise_for_status()
+    content = response.content
+    return FetchResult(content, _merge_validators(response, content_hash(content)))
+
+
+def _fetch_error(url: str) -> SpecFetchError:
+    return SpecFetchError(f"Не удалось получить спецификацию по адресу {url!r}")
+
+
 class SpecFetcher:
     """Отвечает только за загрузку спецификации по сети."""
 
-    def __init__(self, settings: FetchSettings | None = None) -> None:
+    def __init__(self, settings: FetchSettings | None = None, transport: httpx.BaseTransport | None = None) -> None:
         self._settings = settings or FetchSettings()
+        self._transport = transport
 
     def fetch(self, url: str) -> dict[str, Any]:
+        return load_spec(self.fetch_bytes(url))
+
+    def fetch_bytes(self, url: str) -> bytes:
+        content = self.fetch_if_changed(url).content
+        assert content is not None  # без валидаторов сервер не может ответить 304
+        return content
+
+    def fetch_if_changed(self, url: str, validators: SpecValidators | None = None) -> FetchResult:
+        """Conditional GET: sends ``If-None-Match``/``If-Modified-Since`` built from ``validators``."""
+        headers = validators.request_headers() if validators else {}
         try:
-            with httpx.Client(timeout=self._settings.timeout, verify=self._settings.verify_ssl) as client:
-                response = client.get(url)
-                response.raise_for_status()
-                return response.json()
+            with httpx.Client(
+                timeout=self._settings.timeout, verify=self._settings.verify_ssl, transport=self._transport
+            ) as client:
+                return _build_result(client.get(url, headers=headers), validators)
         except httpx.HTTPError as exc:  # pragma: no cover - httpx already протестирован
-            raise SpecFetchError(f"Не удалось получить спецификацию по адресу {url!r}") from exc
+            raise _fetch_error(url) from exc
+
+
+class PrefetchedSpecFetcher(SpecFetcher):
+    """Отдаёт заранее скачанные ответы, а для остальных адресов ходит в сеть."""
+
+    def __init__(
+        self,
+        results: Mapping[str, FetchResult | SpecFetchError],
+        settings: FetchSettings | None = None,
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        super().__init__(settings=settings, transport=transport)
+        self._results = dict(results)
+
+    def fetch_if_changed(self, url: str, validators: SpecValidators | None = None) -> FetchResult:
+        result = self._results.pop(url, None)
+        if isinstance(result, SpecFetchError):
+            raise result
+        # 304 бесполезен, если вызывающему понадобилось полное содержимое.
+        if result is None or (result.not_modified and validators is None):
+            return super().fetch_if_changed(url, validators)
+        return result
+
+
+class AsyncSpecFetcher:
+    """Загружает несколько спецификаций одновременно через один пул соединений с keep-alive.
+
+    HTTP/2 включается, если установлен пакет ``h2``. Сжатие ответа httpx запрашивает сам через
+    ``Accept-Encoding`` (gzip/deflate, а также br и zstd при наличии декодеров).
+    """
+
+    def __init__(
+        self,
+        settings: FetchSettings | None = None,
+        *,
+        max_concurrency: int = 10,
+        http2: bool | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._settings = settings or FetchSettings()
+        self.max_concurrency = max(max_concurrency, 1)
+        self.http2 = self._resolve_http2(http2)
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    @staticmethod
+    def _resolve_http2(requested: bool | None) -> bool:
+        available = importlib.util.find_spec("h2") is not None
+        if requested and not available:
+            LOGGER.warning("HTTP/2 requested but the 'h2' package is not installed, falling back to HTTP/1.1")
+        return available if requested is None else requested and available
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+            self._client = httpx.AsyncClient(
+                timeout=self._settings.timeout,
+                verify=self._settings.verify_ssl,
+                http2=self.http2,
+                limits=limits,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "AsyncSpecFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def fetch_if_changed(self, url: str, validators: SpecValidators | None = None) -> FetchResult:
+        headers = validators.request_headers() if validators else {}
+        try:
+            return _build_result(await self.client.get(url, headers=headers), validators)
+        except httpx.HTTPError as exc:
+            raise _fetch_error(url) from exc
+
+    async def fetch_many(
+        self, requests: Iterable[tuple[str, SpecValidators | None]]
+    ) -> list[FetchResult | SpecFetchError]:
+        """Fetches every ``(url, validators)`` pair, at most ``max_concurrency`` at a time, preserving order."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch_one(url: str, validators: SpecValidators | None) -> FetchResult | SpecFetchError:
+            async with semaphore:
+                try:
+                    return await self.fetch_if_changed(url, validators)
+                except SpecFetchError as exc:
+                    return exc
+
+        return list(await asyncio.gather(*(fetch_one(url, validators) for url, validators in requests)))
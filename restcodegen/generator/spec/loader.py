@@ -1,12 +1,24 @@
 from __future__ import annotations
 
 import json
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Any
 
 from restcodegen.generator.log import LOGGER
-from restcodegen.generator.spec.fetcher import FetchSettings, SpecFetcher, SpecFetchError
+from restcodegen.generator.manifest import fingerprint
+from restcodegen.generator.profiling import stage
+from restcodegen.generator.spec.cache import SpecCache, project_cache_dir, tool_versions
+from restcodegen.generator.spec.fetcher import (
+    FetchSettings,
+    SpecFetcher,
+    SpecFetchError,
+    SpecValidators,
+    content_hash,
+)
 from restcodegen.generator.spec.normalizer import SpecNormalizer
+from restcodegen.generator.spec.pruner import SpecPruner
+from restcodegen.generator.spec.source import SpecContent, dump_json, is_json, load_json, load_yaml, map_file
 from restcodegen.generator.utils import is_url, name_to_snake
 
 
@@ -21,6 +33,8 @@ class SpecLoader:
         fetcher: SpecFetcher | None = None,
         normalizer: SpecNormalizer | None = None,
         fetch_settings: FetchSettings | None = None,
+        use_cache: bool = True,
+        pruner: SpecPruner | None = None,
     ) -> None:
         self.spec_path = spec
         self.service_name = service_name
@@ -30,56 +44,185 @@ class SpecLoader:
             self.cache_spec_dir.mkdir(parents=True, exist_ok=True)
 
         self.cache_spec_path = self.cache_spec_dir / f"{name_to_snake(self.service_name)}.json"
+        self.cache_meta_path = self.cache_spec_dir / f"{name_to_snake(self.service_name)}.meta.json"
         self._fetcher = fetcher or SpecFetcher(settings=fetch_settings)
         self._normalizer = normalizer or SpecNormalizer()
+        self._pruner = pruner
+        # Бинарные кэши лежат вне дерева клиентов: оно коммитится, а pickle из него исполнял бы чужой код.
+        binary_cache_dir = project_cache_dir(self.cache_spec_dir)
+        self.normalized_cache = (
+            SpecCache(binary_cache_dir / f"{name_to_snake(self.service_name)}.normalized.pickle") if use_cache else None
+        )
+        # YAML разбирается на порядок медленнее JSON, поэтому результат кэшируется отдельно от
+        # нормализованной спецификации и переживает смену набора преобразований.
+        self.yaml_cache = (
+            SpecCache(binary_cache_dir / f"{name_to_snake(self.service_name)}.yaml.pickle") if use_cache else None
+        )
+        self.fingerprint: str | None = None
+        self._artifacts: dict[str, Any] = {}
 
-    def _get_spec_by_url(self) -> dict[str, Any] | None:
+    @property
+    def pruner(self) -> SpecPruner | None:
+        return self._pruner
+
+    @pruner.setter
+    def pruner(self, pruner: SpecPruner | None) -> None:
+        """Takes effect on the next ``open()``; the pruner is part of the normalized cache key."""
+        self._pruner = pruner
+
+    def _get_spec_by_url(self, stack: ExitStack) -> SpecContent | None:
         if not is_url(self.spec_path):
             return None
 
+        validators = self.stored_validators()
         try:
-            spec = self._fetcher.fetch(self.spec_path)
+            with stage("fetch", url=self.spec_path):
+                result = self._fetcher.fetch_if_changed(self.spec_path, validators)
+            if result.content is None:
+                cached = self._read_cached_copy(stack)
+                if cached is not None:
+                    LOGGER.info("OpenAPI spec not modified, using cached copy: %s", self.cache_spec_path)
+                    self._write_validators(result.validators, validators)
+                    return cached
+                with stage("fetch", url=self.spec_path):
+                    result = self._fetcher.fetch_if_changed(self.spec_path)
         except SpecFetchError as exc:
             LOGGER.warning("OpenAPI spec not available by url %s: %s", self.spec_path, exc)
             return None
 
-        self._write_cache(spec)
-        return spec
+        content = result.content
+        assert content is not None
+        if not is_json(content):
+            content = self._yaml_as_json(content)
+        if validators is None or validators.content_hash != result.validators.content_hash:
+            self._write_cache(content)
+        self._write_validators(result.validators, validators)
+        return content
+
+    def _yaml_as_json(self, content: bytes) -> bytes:
+        """The cached copy is ``<service>.json``, so a downloaded YAML spec is stored there as JSON.
+
+        Decoding goes through the YAML cache, so an unchanged download is not parsed again.
+        """
+        spec = self._decode(content, content_hash(content))
+        try:
+            return dump_json(spec)
+        except (TypeError, ValueError) as exc:
+            LOGGER.warning("Unable to convert YAML spec %s to JSON, caching it as is: %s", self.spec_path, exc)
+            return content
+
+    def _read_cached_copy(self, stack: ExitStack) -> SpecContent | None:
+        try:
+            return stack.enter_context(map_file(self.cache_spec_path))
+        except OSError:
+            return None
+
+    def stored_validators(self) -> SpecValidators | None:
+        """Validators are only trusted while the cached copy they describe exists."""
+        if not self.cache_spec_path.exists():
+            return None
+        try:
+            data = json.loads(self.cache_meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return SpecValidators.from_dict(data) if isinstance(data, dict) else None
+
+    def _write_validators(self, validators: SpecValidators, previous: SpecValidators | None) -> None:
+        if validators == previous:
+            return
+        try:
+            self.cache_meta_path.write_text(json.dumps(validators.to_dict(), indent=4), encoding="utf-8")
+        except OSError as exc:
+            LOGGER.warning("Unable to write cache file %s: %s", self.cache_meta_path, exc)
 
-    def _get_spec_from_cache(self) -> dict[str, Any]:
+    def _get_spec_from_cache(self, stack: ExitStack) -> SpecContent:
         try:
-            with open(self.cache_spec_path) as f:
-                spec = json.loads(f.read())
-                self.spec_path = self.cache_spec_path  # type: ignore
-                LOGGER.warning("OpenAPI spec loaded from cache: %s", self.spec_path)
-                return spec
+            content = stack.enter_context(map_file(self.cache_spec_path))
         except FileNotFoundError as e:
             raise FileNotFoundError(
                 f"OpenAPI spec not available from url: {self.spec_path}, and not found in cache"
             ) from e
+        self.spec_path = self.cache_spec_path  # type: ignore
+        LOGGER.warning("OpenAPI spec loaded from cache: %s", self.spec_path)
+        return content
 
-    def _get_spec_by_path(self) -> dict[str, Any] | None:
+    def _get_spec_by_path(self, stack: ExitStack) -> SpecContent | None:
         try:
-            with open(self.spec_path) as f:
-                spec = json.loads(f.read())
+            with stage("read", path=self.spec_path):
+                return stack.enter_context(map_file(self.spec_path))
         except FileNotFoundError:
             LOGGER.warning("OpenAPI spec not found from local path: %s", self.spec_path)
             return None
-        else:
-            return spec
 
-    def _write_cache(self, spec: dict[str, Any]) -> None:
+    def _write_cache(self, content: bytes) -> None:
         try:
-            with open(self.cache_spec_path, "w", encoding="utf-8") as f:
-                f.write(json.dumps(spec, indent=4, ensure_ascii=False))
+            self.cache_spec_path.write_bytes(content)
         except OSError as exc:
             LOGGER.warning("Unable to write cache file %s: %s", self.cache_spec_path, exc)
 
+    def _read_source(self, stack: ExitStack) -> SpecContent:
+        """Remote specs arrive as bytes; local and cached files are memory-mapped until ``stack`` closes."""
+        content = self._get_spec_by_url(stack)
+        if content is None:
+            content = self._get_spec_by_path(stack)
+        if content is None:
+            content = self._get_spec_from_cache(stack)
+        return content
+
     def open(self) -> dict[str, Any]:
-        spec: dict[str, Any] | None = self._get_spec_by_url()
-        if spec is None:
-            spec = self._get_spec_by_path()
-        if spec is None:
-            spec = self._get_spec_from_cache()
+        with ExitStack() as stack:
+            return self._open(self._read_source(stack))
+
+    def _open(self, content: SpecContent) -> dict[str, Any]:
+        if self.normalized_cache is None:
+            return self._normalizer.normalize(self._prune(self._decode(content)))
+
+        digest = content_hash(content)
+        pruner_token = self._pruner.cache_token() if self._pruner is not None else None
+        self.fingerprint = fingerprint(digest, pruner_token, self._normalizer.cache_token(), tool_versions())
+        with stage("cache.read"):
+            self._artifacts = self.normalized_cache.load(self.fingerprint)
+        spec = self._artifacts.get("spec")
+        if spec is not None:
+            LOGGER.info("Normalized OpenAPI spec loaded from cache: %s", self.normalized_cache.path)
+            return spec
+
+        spec = self._normalizer.normalize(self._prune(self._decode(content, digest)))
+        self.store_artifact("spec", spec)
+        return spec
+
+    def _prune(self, spec: dict[str, Any]) -> dict[str, Any]:
+        if self._pruner is None:
+            return spec
+        with stage("prune"):
+            return self._pruner.prune(spec)
+
+    def _decode(self, content: SpecContent, digest: str | None = None) -> dict[str, Any]:
+        if is_json(content):
+            with stage("decode"):
+                return load_json(content)
+
+        key = fingerprint(digest, tool_versions()) if digest is not None else None
+        if self.yaml_cache is not None and key is not None:
+            with stage("cache.read", artifact="yaml"):
+                cached = self.yaml_cache.load(key).get("spec")
+            if cached is not None:
+                return cached
+
+        with stage("decode.yaml"):
+            spec = load_yaml(content)
+        if self.yaml_cache is not None and key is not None:
+            with stage("cache.write", artifact="yaml"):
+                self.yaml_cache.store(key, {"spec": spec})
+        return spec
+
+    def cached_artifact(self, name: str) -> Any | None:
+        """Artifact stored for the spec returned by the last ``open()`` call, if any."""
+        return self._artifacts.get(name)
 
-        return self._normalizer.normalize(spec)
+    def store_artifact(self, name: str, value: Any) -> None:
+        if self.normalized_cache is None or self.fingerprint is None:
+            return
+        self._artifacts[name] = value
+        with stage("cache.write", artifact=name):
+            self.normalized_cache.store(self.fingerprint, self._artifacts)
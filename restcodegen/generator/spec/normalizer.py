@@ -1,27 +1,60 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, Protocol
+from typing import Any, Iterable, Protocol, Union
 
+from restcodegen.generator.profiling import stage
 from restcodegen.generator.spec.patchers import ComponentSchemaPatcher, InlineSchemaExtractor
+from restcodegen.generator.spec.walker import SpecVisitor, walk_spec
 
 
 class SpecTransform(Protocol):
     def patch(self, spec: dict[str, Any]) -> dict[str, Any]: ...
 
 
+Transform = Union[SpecTransform, SpecVisitor]
+
+
 class SpecNormalizer:
-    def __init__(self, transforms: Iterable[SpecTransform] | None = None) -> None:
+    """Applies transforms in order; consecutive ``SpecVisitor`` transforms share a single copy-on-write walk.
+
+    A transform may expose a ``version`` attribute: it is part of the cache key of normalized specs,
+    so bumping it invalidates results cached with the previous behaviour.
+    """
+
+    def __init__(self, transforms: Iterable[Transform] | None = None) -> None:
         default_transforms = (InlineSchemaExtractor(), ComponentSchemaPatcher())
         self._transforms = list(transforms or default_transforms)
 
-    def add_transform(self, transform: SpecTransform) -> None:
+    def add_transform(self, transform: Transform) -> None:
         self._transforms.append(transform)
 
+    def cache_token(self) -> list[str]:
+        return [
+            f"{type(transform).__module__}.{type(transform).__qualname__}:{getattr(transform, 'version', '')}"
+            for transform in self._transforms
+        ]
+
     def normalize(self, spec: dict[str, Any]) -> dict[str, Any]:
         if not spec:
             return {}
 
         normalized = spec
-        for transform in self._transforms:
-            normalized = transform.patch(normalized)
+        for step in self._stages():
+            if isinstance(step, list):
+                with stage("normalize." + "+".join(type(visitor).__name__ for visitor in step)):
+                    normalized = walk_spec(normalized, step)
+            else:
+                with stage(f"normalize.{type(step).__name__}"):
+                    normalized = step.patch(normalized)
         return normalized
+
+    def _stages(self) -> list[SpecTransform | list[SpecVisitor]]:
+        stages: list[SpecTransform | list[SpecVisitor]] = []
+        for transform in self._transforms:
+            if not isinstance(transform, SpecVisitor):
+                stages.append(transform)
+            elif stages and isinstance(stages[-1], list):
+                stages[-1].append(transform)
+            else:
+                stages.append([transform])
+        return stages
@@ -1,31 +1,73 @@
 from __future__ import annotations
 
-import copy
 import json
 from typing import Any
 
+from restcodegen.generator.spec.walker import JsonPath, walk_spec
+
 
 class ComponentSchemaPatcher:
     """Удаляет точки из названий схем и тегов, обновляя все ссылки."""
 
+    version = "1"
+
+    def __init__(self) -> None:
+        self._renames: dict[str, str] = {}
+
     def patch(self, swagger_scheme: dict[str, Any]) -> dict[str, Any]:
-        spec = copy.deepcopy(swagger_scheme)
-        self._ensure_components_exist(spec)
+        return walk_spec(swagger_scheme, [self])
+
+    def prepare(self, spec: dict[str, Any]) -> None:
+        self._renames = {name: name.replace(".", "") for name in self._collect_names_with_dots(spec)}
 
-        json_content = json.dumps(spec)
-        for name in self._collect_names_with_dots(spec):
-            clean_name = name.replace(".", "")
-            for marker in (f'/{name}"', f'"{name}"'):
-                json_content = json_content.replace(marker, marker.replace(name, clean_name))
+    def visit(self, node: Any, path: JsonPath) -> Any:
+        """Renames keys and strings equal to a dotted name, or ending in ``/name`` (refs, discriminator mappings)."""
+        if isinstance(node, list):
+            return self._rename_list(node)
+        node = self._rename_dict(node)
+        if not path:
+            node = self._ensure_components_exist(node)
+        return node
 
-        patched = json.loads(json_content)
-        self._clean_tags(patched)
-        return patched
+    def _rename_dict(self, node: dict[Any, Any]) -> dict[str, Any]:
+        changed = False
+        items: list[tuple[str, Any]] = []
+        for key, value in node.items():
+            new_key = self._rename_key(key)
+            new_value = self._rename_string(value) if isinstance(value, str) else value
+            changed = changed or new_key is not key or new_value is not value
+            items.append((new_key, new_value))
+        return dict(items) if changed else node
+
+    def _rename_list(self, node: list[Any]) -> list[Any]:
+        if not self._renames:
+            return node
+        renamed = [self._rename_string(item) if isinstance(item, str) else item for item in node]
+        return renamed if any(new is not old for new, old in zip(renamed, node)) else node
+
+    def _rename_key(self, key: Any) -> str:
+        # Non-string keys (e.g. integer status codes from YAML) are stringified the way JSON does it.
+        return self._rename_string(key if isinstance(key, str) else json.dumps(key))
+
+    def _rename_string(self, value: str) -> str:
+        if not self._renames:
+            return value
+        renamed = self._renames.get(value)
+        if renamed is not None:
+            return renamed
+        head, separator, tail = value.rpartition("/")
+        if separator and tail in self._renames:
+            return f"{head}/{self._renames[tail]}"
+        return value
 
     @staticmethod
-    def _ensure_components_exist(spec: dict[str, Any]) -> None:
-        spec.setdefault("components", {})
-        spec["components"].setdefault("schemas", {})
+    def _ensure_components_exist(spec: dict[str, Any]) -> dict[str, Any]:
+        components = spec.get("components")
+        if isinstance(components, dict) and "schemas" in components:
+            return spec
+        spec = dict(spec)
+        spec["components"] = {**(components or {}), "schemas": {}}
+        return spec
 
     @staticmethod
     def _collect_names_with_dots(spec: dict[str, Any]) -> list[str]:
@@ -41,15 +83,3 @@ class ComponentSchemaPatcher:
                     if "." in tag:
                         names.append(tag)
         return names
-
-    @staticmethod
-    def _clean_tags(spec: dict[str, Any]) -> None:
-        for path_item in spec.get("paths", {}).values():
-            if not isinstance(path_item, dict):
-                continue
-            for operation in path_item.values():
-                if not isinstance(operation, dict):
-                    continue
-                tags = operation.get("tags")
-                if tags:
-                    operation["tags"] = [tag.replace(".", "") for tag in tags]
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
 import copy
+from collections.abc import Iterator
 from typing import Any
 
+COMBINERS = ("allOf", "oneOf", "anyOf")
+
+# (контейнер, ключ в контейнере, inline-схема, имя новой схемы)
+ExtractionSite = tuple[Any, Any, dict[str, Any], str]
+
 
 class InlineSchemaExtractor:
-    """Выносит inline-схемы из paths в components.schemas."""
+    """Выносит inline-схемы из paths в components.schemas.
+
+    С ``in_place=True`` изменяет переданную спецификацию без глубокого копирования.
+    """
 
-    def __init__(self) -> None:
+    version = "1"
+
+    def __init__(self, *, in_place: bool = False) -> None:
+        self.in_place = in_place
         self.swagger_scheme: dict[str, Any] = {}
         self.processed_schemas: set[str] = set()
 
     def patch(self, swagger_scheme: dict[str, Any]) -> dict[str, Any]:
-        self.swagger_scheme = copy.deepcopy(swagger_scheme)
+        self.swagger_scheme = swagger_scheme if self.in_place else copy.deepcopy(swagger_scheme)
+        self.processed_schemas = set()
         self._ensure_components_exist()
         self._extract_all_schemas()
         return self.swagger_scheme
@@ -26,18 +39,13 @@ class InlineSchemaExtractor:
         self._process_component_schemas()
 
     def _process_component_schemas(self) -> None:
-        schemas = self.swagger_scheme.get("components", {}).get("schemas", {})
-        self.processed_schemas = set()
-
-        while True:
-            schemas_to_process = set(schemas.keys()) - self.processed_schemas
-            if not schemas_to_process:
-                break
-
-            for schema_name in schemas_to_process:
-                schema = schemas[schema_name]
-                self._process_schema(schema, schema_name)
-                self.processed_schemas.add(schema_name)
+        schemas = self.swagger_scheme["components"]["schemas"]
+        # Схемы, вынесенные во время обхода, обрабатываются сразу, поэтому достаточно снимка имён.
+        for schema_name in list(schemas):
+            if schema_name in self.processed_schemas:
+                continue
+            self.processed_schemas.add(schema_name)
+            self._process_schema(schemas[schema_name], schema_name)
 
     def _extract_inline_schemas_from_paths(self) -> None:
         operation_names = {"get", "put", "post", "delete", "patch", "head", "options", "trace"}
@@ -56,7 +64,7 @@ class InlineSchemaExtractor:
         if "requestBody" not in method or "content" not in method["requestBody"]:
             return
 
-        for _, content in method["requestBody"]["content"].items():
+        for content in method["requestBody"]["content"].values():
             if "schema" not in content:
                 continue
 
@@ -65,8 +73,7 @@ class InlineSchemaExtractor:
                 continue
 
             schema_name = f"{operation_id}_request_body"
-            self.swagger_scheme["components"]["schemas"][schema_name] = schema
-            content["schema"] = {"$ref": f"#/components/schemas/{schema_name}"}
+            self._extract(content, "schema", schema, schema_name)
             self._process_schema(schema, schema_name)
 
     def _process_responses(self, method: dict[str, Any], operation_id: str) -> None:
@@ -77,7 +84,7 @@ class InlineSchemaExtractor:
             if "content" not in response:
                 continue
 
-            for _, content in response["content"].items():
+            for content in response["content"].values():
                 if "schema" not in content:
                     continue
 
@@ -86,8 +93,7 @@ class InlineSchemaExtractor:
                     continue
 
                 schema_name = f"{operation_id}_response_{status_code}"
-                self.swagger_scheme["components"]["schemas"][schema_name] = schema
-                content["schema"] = {"$ref": f"#/components/schemas/{schema_name}"}
+                self._extract(content, "schema", schema, schema_name)
                 self._process_schema(schema, schema_name)
 
     def _process_parameters(self, method: dict[str, Any], operation_id: str) -> None:
@@ -103,17 +109,38 @@ class InlineSchemaExtractor:
                 continue
 
             schema_name = f"{operation_id}_param_{param.get('name', i)}"
-            self.swagger_scheme["components"]["schemas"][schema_name] = schema
-            param["schema"] = {"$ref": f"#/components/schemas/{schema_name}"}
+            self._extract(param, "schema", schema, schema_name)
             self._process_schema(schema, schema_name)
 
+    def _extract(self, container: Any, key: Any, schema: dict[str, Any], schema_name: str) -> None:
+        self.swagger_scheme["components"]["schemas"][schema_name] = schema
+        container[key] = {"$ref": f"#/components/schemas/{schema_name}"}
+        self.processed_schemas.add(schema_name)
+
     def _process_schema(self, schema: dict[str, Any], schema_name: str) -> None:
-        self._process_combined_schemas(schema, schema_name)
-        self._process_object_properties(schema, schema_name)
-        self._process_array_schema(schema, schema_name)
+        """Depth-first extraction of nested schemas in the same order the recursive version produced."""
+        stack: list[Iterator[ExtractionSite]] = [self._iter_nested_schemas(schema, schema_name)]
+        while stack:
+            site = next(stack[-1], None)
+            if site is None:
+                stack.pop()
+                continue
 
-    def _process_combined_schemas(self, schema: dict[str, Any], schema_name: str) -> None:
-        for combiner in ["allOf", "oneOf", "anyOf"]:
+            container, key, nested_schema, nested_name = site
+            self._extract(container, key, nested_schema, nested_name)
+            stack.append(self._iter_nested_schemas(nested_schema, nested_name))
+
+    def _iter_nested_schemas(self, schema: dict[str, Any], schema_name: str) -> Iterator[ExtractionSite]:
+        if not isinstance(schema, dict):
+            return
+        yield from self._iter_combined_schemas(schema, schema_name)
+        yield from self._iter_object_properties(schema, schema_name)
+        if schema.get("type") == "array" and "items" in schema:
+            yield from self._iter_array_items(schema, schema_name)
+
+    @staticmethod
+    def _iter_combined_schemas(schema: dict[str, Any], schema_name: str) -> Iterator[ExtractionSite]:
+        for combiner in COMBINERS:
             if combiner not in schema:
                 continue
 
@@ -121,12 +148,9 @@ class InlineSchemaExtractor:
                 if "$ref" in sub_schema or sub_schema.get("type") != "object":
                     continue
 
-                sub_schema_name = f"{schema_name}_{combiner}_{i}"
-                self.swagger_scheme["components"]["schemas"][sub_schema_name] = sub_schema
-                schema[combiner][i] = {"$ref": f"#/components/schemas/{sub_schema_name}"}
-                self._process_schema(sub_schema, sub_schema_name)
+                yield schema[combiner], i, sub_schema, f"{schema_name}_{combiner}_{i}"
 
-    def _process_object_properties(self, schema: dict[str, Any], schema_name: str) -> None:
+    def _iter_object_properties(self, schema: dict[str, Any], schema_name: str) -> Iterator[ExtractionSite]:
         if schema.get("type") != "object" or "properties" not in schema:
             return
 
@@ -135,28 +159,19 @@ class InlineSchemaExtractor:
                 continue
 
             if prop_schema.get("type") == "object" and "properties" in prop_schema:
-                nested_schema_name = f"{schema_name}_{prop_name}"
-                self.swagger_scheme["components"]["schemas"][nested_schema_name] = prop_schema
-                schema["properties"][prop_name] = {"$ref": f"#/components/schemas/{nested_schema_name}"}
-                self._process_schema(prop_schema, nested_schema_name)
+                yield schema["properties"], prop_name, prop_schema, f"{schema_name}_{prop_name}"
             elif prop_schema.get("type") == "array" and "items" in prop_schema:
-                self._process_array_items(prop_schema, f"{schema_name}_{prop_name}")
-
-    def _process_array_schema(self, schema: dict[str, Any], schema_name: str) -> None:
-        if schema.get("type") == "array" and "items" in schema:
-            self._process_array_items(schema, schema_name)
+                yield from self._iter_array_items(prop_schema, f"{schema_name}_{prop_name}")
 
-    def _process_array_items(self, array_schema: dict[str, Any], schema_name: str) -> None:
+    @staticmethod
+    def _iter_array_items(array_schema: dict[str, Any], schema_name: str) -> Iterator[ExtractionSite]:
         items_schema = array_schema["items"]
         if "$ref" in items_schema:
             return
 
         needs_extraction = (items_schema.get("type") == "object" and "properties" in items_schema) or any(
-            combiner in items_schema for combiner in ["allOf", "oneOf", "anyOf"]
+            combiner in items_schema for combiner in COMBINERS
         )
 
         if needs_extraction:
-            items_schema_name = f"{schema_name}_item"
-            self.swagger_scheme["components"]["schemas"][items_schema_name] = items_schema
-            array_schema["items"] = {"$ref": f"#/components/schemas/{items_schema_name}"}
-            self._process_schema(items_schema, items_schema_name)
+            yield array_schema, "items", items_schema, f"{schema_name}_item"
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import astuple, dataclass
+from fnmatch import fnmatchcase
+from typing import Any
+
+from restcodegen.generator.log import LOGGER
+
+OPERATION_NAMES = {"get", "put", "post", "delete", "patch", "head", "options", "trace"}
+
+# Разделы components, из которых удаляются недостижимые элементы; остальные сохраняются как есть.
+PRUNED_SECTIONS = ("schemas", "parameters", "requestBodies", "responses", "headers")
+
+ComponentKey = tuple[str, str]
+
+
+class OperationFilterError(ValueError):
+    """Raised when фильтр операций не оставил ни одной операции."""
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _parse_ref(ref: str) -> ComponentKey | None:
+    """``#/components/schemas/Pet/properties/id`` -> ``("schemas", "Pet")``; Swagger 2 definitions included."""
+    if not ref.startswith("#/"):
+        return None
+    parts = ref[2:].split("/")
+    if parts[0] == "components" and len(parts) >= 3:
+        return parts[1], _unescape(parts[2])
+    if parts[0] == "definitions" and len(parts) >= 2:
+        return "definitions", _unescape(parts[1])
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class OperationFilter:
+    """Отбор операций по glob-шаблону пути, operationId и HTTP-методу.
+
+    Операция проходит, если совпадает хотя бы с одним include-условием каждого заданного вида
+    и ни с одним exclude-условием. ``*`` в шаблоне пути совпадает и с ``/``.
+    """
+
+    include_paths: tuple[str, ...] = ()
+    exclude_paths: tuple[str, ...] = ()
+    include_operation_ids: tuple[str, ...] = ()
+    exclude_operation_ids: tuple[str, ...] = ()
+    include_methods: tuple[str, ...] = ()
+    exclude_methods: tuple[str, ...] = ()
+
+    def __bool__(self) -> bool:
+        return any(astuple(self))
+
+    def matches(self, path: str, method: str, operation: dict[str, Any]) -> bool:
+        method = method.lower()
+        operation_id = operation.get("operationId")
+        if self.include_paths and not any(fnmatchcase(path, pattern) for pattern in self.include_paths):
+            return False
+        if any(fnmatchcase(path, pattern) for pattern in self.exclude_paths):
+            return False
+        if self.include_operation_ids and operation_id not in self.include_operation_ids:
+            return False
+        if operation_id in self.exclude_operation_ids:
+            return False
+        if self.include_methods and method not in {item.lower() for item in self.include_methods}:
+            return False
+        return method not in {item.lower() for item in self.exclude_methods}
+
+
+class SpecPruner:
+    """Оставляет только выбранные операции и компоненты, достижимые из них по ``$ref``.
+
+    Работает с исходной (ещё не нормализованной) спецификацией: тег выбирается и по исходному имени,
+    и по имени без точек, которое видит пользователь после нормализации. Если по одним тегам не выбрана
+    ни одна операция, спецификация возвращается без изменений; пустой результат фильтра операций — ошибка.
+    """
+
+    version = "2"
+
+    def __init__(self, selected_tags: Iterable[str] = (), operation_filter: OperationFilter | None = None) -> None:
+        self.selected_tags = frozenset(selected_tags)
+        self.operation_filter = operation_filter or OperationFilter()
+
+    def cache_token(self) -> list[Any]:
+        return [type(self).__name__, self.version, sorted(self.selected_tags), astuple(self.operation_filter)]
+
+    def _is_selected(self, path: str, method: str, operation: dict[str, Any]) -> bool:
+        if self.selected_tags and not any(
+            isinstance(tag, str) and (tag in self.selected_tags or tag.replace(".", "") in self.selected_tags)
+            for tag in operation.get("tags") or []
+        ):
+            return False
+        return self.operation_filter.matches(path, method, operation)
+
+    def prune(self, spec: dict[str, Any]) -> dict[str, Any]:
+        if not (self.selected_tags or self.operation_filter) or not isinstance(spec.get("paths"), dict):
+            return spec
+
+        paths = self._select_paths(spec["paths"])
+        if not paths:
+            if self.operation_filter:
+                raise OperationFilterError(f"No operation matches the operation filter: {self.operation_filter}")
+            LOGGER.warning("No operation matches the selected tags, the spec is used as is")
+            return spec
+
+        reachable = self._reachable_components(spec, paths.values())
+        pruned = dict(spec)
+        pruned["paths"] = paths
+        if isinstance(spec.get("components"), dict):
+            pruned["components"] = self._prune_components(spec["components"], reachable)
+        if isinstance(spec.get("definitions"), dict):
+            pruned["definitions"] = {
+                name: schema for name, schema in spec["definitions"].items() if ("definitions", name) in reachable
+            }
+        return pruned
+
+    def _select_paths(self, paths: dict[str, Any]) -> dict[str, Any]:
+        selected: dict[str, Any] = {}
+        for path, path_item in paths.items():
+            if not isinstance(path_item, dict):
+                continue
+            operations = {
+                method: operation
+                for method, operation in path_item.items()
+                if method in OPERATION_NAMES
+                and isinstance(operation, dict)
+                and self._is_selected(path, method, operation)
+            }
+            if operations:
+                shared = {key: value for key, value in path_item.items() if key not in OPERATION_NAMES}
+                selected[path] = {**shared, **operations}
+        return selected
+
+    @staticmethod
+    def _reachable_components(spec: dict[str, Any], roots: Iterable[Any]) -> set[ComponentKey]:
+        """Transitive ``$ref`` closure, following discriminator mappings too. Iterative to survive deep schemas."""
+        components = spec["components"] if isinstance(spec.get("components"), dict) else {}
+        definitions = spec["definitions"] if isinstance(spec.get("definitions"), dict) else {}
+        schema_section = "definitions" if definitions and not components else "schemas"
+        schemas = definitions if schema_section == "definitions" else components.get("schemas") or {}
+        reachable: set[ComponentKey] = set()
+        stack: list[Any] = list(roots)
+
+        def follow(key: ComponentKey | None) -> None:
+            if key is None or key in reachable:
+                return
+            reachable.add(key)
+            section, name = key
+            target = definitions.get(name) if section == "definitions" else (components.get(section) or {}).get(name)
+            if target is not None:
+                stack.append(target)
+
+        while True:
+            while stack:
+                node = stack.pop()
+                if isinstance(node, list):
+                    stack.extend(node)
+                    continue
+                if not isinstance(node, dict):
+                    continue
+
+                ref = node.get("$ref")
+                if isinstance(ref, str):
+                    follow(_parse_ref(ref))
+
+                discriminator = node.get("discriminator")
+                if isinstance(discriminator, dict) and isinstance(discriminator.get("mapping"), dict):
+                    for target in discriminator["mapping"].values():
+                        if isinstance(target, str):
+                            follow(_parse_ref(target) if target.startswith("#") else (schema_section, target))
+
+                stack.extend(value for key, value in node.items() if key != "$ref")
+
+            # Без явного mapping подтипы дискриминатора ссылаются на родителя через allOf, а не наоборот.
+            for name, schema in schemas.items():
+                if (schema_section, name) not in reachable and SpecPruner._extends_polymorphic(
+                    schema, schema_section, schemas, reachable
+                ):
+                    follow((schema_section, name))
+            if not stack:
+                return reachable
+
+    @staticmethod
+    def _extends_polymorphic(schema: Any, section: str, schemas: dict[str, Any], reachable: set[ComponentKey]) -> bool:
+        if not isinstance(schema, dict) or not isinstance(schema.get("allOf"), list):
+            return False
+        for part in schema["allOf"]:
+            key = _parse_ref(part["$ref"]) if isinstance(part, dict) and isinstance(part.get("$ref"), str) else None
+            if key is None or key not in reachable or key[0] != section:
+                continue
+            parent = schemas.get(key[1])
+            if isinstance(parent, dict) and isinstance(parent.get("discriminator"), dict):
+                return True
+        return False
+
+    @staticmethod
+    def _prune_components(components: dict[str, Any], reachable: set[ComponentKey]) -> dict[str, Any]:
+        pruned = dict(components)
+        for section in PRUNED_SECTIONS:
+            items = components.get(section)
+            if isinstance(items, dict):
+                pruned[section] = {name: item for name, item in items.items() if (section, name) in reachable}
+        return pruned
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None  # type: ignore[assignment]
+
+SpecContent = bytes | memoryview
+
+_YAML_BASE_LOADER: Any = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_TIMESTAMP_TAG = "tag:yaml.org,2002:timestamp"
+
+
+class SpecYamlLoader(_YAML_BASE_LOADER):  # type: ignore[misc, valid-type]
+    """Safe loader (libyaml-backed when available) that keeps dates as strings, as they are in JSON specs."""
+
+
+SpecYamlLoader.yaml_implicit_resolvers = {
+    first_char: [(tag, regexp) for tag, regexp in resolvers if tag != _YAML_TIMESTAMP_TAG]
+    for first_char, resolvers in _YAML_BASE_LOADER.yaml_implicit_resolvers.items()
+}
+
+
+@contextmanager
+def map_file(path: str | Path) -> Iterator[SpecContent]:
+    """Read-only memory map of ``path``: pages are loaded lazily and never copied into a Python string."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+def load_json(content: SpecContent) -> Any:
+    """Parses JSON straight from a buffer with orjson when it is installed.
+
+    orjson only accepts UTF-8 and 64-bit integers; anything else falls back to the standard library.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(bytes(content) if isinstance(content, memoryview) else content)
+
+
+def dump_json(data: Any) -> bytes:
+    """Compact UTF-8 JSON; non-string keys (``200:`` in YAML) become strings, as ``json.dumps`` does."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def is_json(content: SpecContent) -> bool:
+    """JSON specs start with an object or array; anything else is treated as YAML."""
+    head = bytes(content[:64]).lstrip(b"\xef\xbb\xbf \t\r\n")
+    return head[:1] in (b"{", b"[")
+
+
+def load_yaml(content: SpecContent) -> Any:
+    return yaml.load(bytes(content), Loader=SpecYamlLoader)  # noqa: S506 - SpecYamlLoader is a SafeLoader
+
+
+def load_spec(content: SpecContent) -> Any:
+    return load_json(content) if is_json(content) else load_yaml(content)
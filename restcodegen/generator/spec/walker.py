@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import Any, Protocol, runtime_checkable
+
+JsonPath = tuple[str | int, ...]
+
+
+@runtime_checkable
+class SpecVisitor(Protocol):
+    """Transform applied node by node during a single shared walk over the spec.
+
+    ``prepare`` receives the spec before the walk starts. ``visit`` is called for every dict and list,
+    children first, and must not mutate the node: it returns the node itself when nothing changes or
+    a new container that replaces it. Only the ancestors of replaced nodes are copied.
+    """
+
+    def prepare(self, spec: dict[str, Any]) -> None: ...
+
+    def visit(self, node: Any, path: JsonPath) -> Any: ...
+
+
+class _Frame:
+    __slots__ = ("children", "key", "node", "path", "replaced")
+
+    def __init__(self, node: Any, path: JsonPath, key: str | int | None) -> None:
+        self.node = node
+        self.path = path
+        self.key = key
+        self.children: Iterator[tuple[Any, Any]] = iter(node.items()) if isinstance(node, dict) else enumerate(node)
+        self.replaced: dict[Any, Any] | None = None
+
+    def replace(self, key: Any, value: Any) -> None:
+        if self.replaced is None:
+            self.replaced = {}
+        self.replaced[key] = value
+
+    def rebuild(self) -> Any:
+        replaced = self.replaced
+        if replaced is None:
+            return self.node
+        if isinstance(self.node, dict):
+            return {key: replaced[key] if key in replaced else value for key, value in self.node.items()}
+        return [replaced[index] if index in replaced else value for index, value in enumerate(self.node)]
+
+
+def walk_spec(spec: dict[str, Any], visitors: Iterable[SpecVisitor]) -> dict[str, Any]:
+    """Walks ``spec`` once, dispatching every container to all ``visitors`` with copy-on-write semantics."""
+    visitors = list(visitors)
+    for visitor in visitors:
+        visitor.prepare(spec)
+
+    result: Any = spec
+    stack = [_Frame(spec, (), None)]
+    while stack:
+        frame = stack[-1]
+        child = next(frame.children, None)
+        if child is not None:
+            key, value = child
+            if isinstance(value, (dict, list)):
+                stack.append(_Frame(value, (*frame.path, key), key))
+            continue
+
+        stack.pop()
+        node = frame.rebuild()
+        for visitor in visitors:
+            node = visitor.visit(node, frame.path)
+
+        if not stack:
+            result = node
+        elif node is not frame.node:
+            stack[-1].replace(frame.key, node)
+
+    return result
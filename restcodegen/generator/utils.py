@@ -9,6 +9,8 @@ from urllib.parse import urlparse
 
 from datamodel_code_generator.reference import FieldNameResolver
 
+from restcodegen.generator.profiling import stage
+
 
 def is_url(path: str) -> bool:
     parsed = urlparse(path)
@@ -47,9 +49,10 @@ def rename_python_builtins(name: str) -> str:
 
 
 def create_and_write_file(file_path: Path, text: str | None = None) -> None:
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    if text:
-        file_path.write_text(text, encoding="utf-8")
+    with stage("write", path=str(file_path)):
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        if text:
+            file_path.write_text(text, encoding="utf-8")
 
 
 def run_command(command: str | list[str]) -> tuple[int, str | None]:
@@ -63,10 +66,11 @@ def run_command(command: str | list[str]) -> tuple[int, str | None]:
 
 def format_file(output_dir: str | None = None) -> None:
     target = output_dir if output_dir is not None else "./clients/http"
-    command_format = ["ruff", "format", target]
-    run_command(command_format)
-    command_check = ["ruff", "check", target, "--fix"]
-    run_command(command_check)
+    with stage("format", path=target):
+        command_format = ["ruff", "format", target]
+        run_command(command_format)
+        command_check = ["ruff", "check", target, "--fix"]
+        run_command(command_check)
 
 
 @cache
@@ -0,0 +1,93 @@
+"""Deterministic synthetic OpenAPI specs for benchmarks."""
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    operations: int
+    tags: int | None = None
+    schemas: int | None = None
+    depth: int = 2
+    dotted_every: int = 4
+    inline_every: int = 3
+
+    @property
+    def tag_count(self) -> int:
+        return self.tags or max(self.operations // 10, 1)
+
+    @property
+    def schema_count(self) -> int:
+        return self.schemas or max(self.operations // 2, 1)
+
+
+def schema_name(config: SyntheticSpec, index: int) -> str:
+    name = f"Model{index}"
+    return f"ns{index % 7}.{name}" if config.dotted_every and index % config.dotted_every == 0 else name
+
+
+def tag_name(config: SyntheticSpec, index: int) -> str:
+    name = f"tag{index}"
+    return f"group.{name}" if config.dotted_every and index % config.dotted_every == 0 else name
+
+
+def nested_object(prefix: str, depth: int) -> dict[str, Any]:
+    schema: dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            f"{prefix}Id": {"type": "integer"},
+            f"{prefix}Labels": {"type": "array", "items": {"type": "string"}},
+        },
+    }
+    if depth > 0:
+        schema["properties"][f"{prefix}Child"] = nested_object(f"{prefix}Child", depth - 1)
+    return schema
+
+
+def build_schema(config: SyntheticSpec, index: int) -> dict[str, Any]:
+    related = schema_name(config, (index + 1) % config.schema_count)
+    schema = nested_object("field", config.depth)
+    schema["properties"]["related"] = {"$ref": f"#/components/schemas/{related}"}
+    schema["properties"]["history"] = {"type": "array", "items": {"$ref": f"#/components/schemas/{related}"}}
+    schema["required"] = ["fieldId"]
+    return schema
+
+
+def build_operation(config: SyntheticSpec, index: int) -> dict[str, Any]:
+    response_schema = {"$ref": f"#/components/schemas/{schema_name(config, index % config.schema_count)}"}
+    operation: dict[str, Any] = {
+        "operationId": f"operation{index}",
+        "tags": [tag_name(config, index % config.tag_count)],
+        "summary": f"Operation {index}",
+        "parameters": [
+            {"name": "itemId", "in": "path", "required": True, "schema": {"type": "integer"}},
+            {"name": "limit", "in": "query", "required": False, "schema": {"type": "integer"}},
+        ],
+        "responses": {
+            "200": {"description": "OK", "content": {"application/json": {"schema": response_schema}}},
+            "404": {"description": "Not found"},
+        },
+    }
+    if config.inline_every and index % config.inline_every == 0:
+        operation["requestBody"] = {
+            "content": {"application/json": {"schema": nested_object(f"body{index}", config.depth)}}
+        }
+    return operation
+
+
+def build_synthetic_spec(config: SyntheticSpec) -> dict[str, Any]:
+    """Builds a spec with ``config.operations`` operations, two per path (GET and POST)."""
+    paths: dict[str, Any] = {}
+    for index in range(config.operations):
+        method = "get" if index % 2 == 0 else "post"
+        paths.setdefault(f"/resources{index // 2}/{{itemId}}", {})[method] = build_operation(config, index)
+
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Synthetic", "version": "1.0.0"},
+        "paths": paths,
+        "components": {
+            "schemas": {schema_name(config, index): build_schema(config, index) for index in range(config.schema_count)}
+        },
+    }
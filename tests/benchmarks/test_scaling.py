@@ -0,0 +1,120 @@
+"""Scaling benchmarks. Opt-in: ``pytest tests/benchmarks --run-benchmarks``.
+
+Parsing and generation at 10,000 operations are dominated by datamodel-code-generator and take minutes.
+"""
+
+import time
+from collections.abc import Callable
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from restcodegen.generator.codegen import RESTClientGenerator
+from restcodegen.generator.parser import Parser
+from restcodegen.generator.spec import ComponentSchemaPatcher, InlineSchemaExtractor, SpecNormalizer
+from restcodegen.generator.utils import format_file
+from tests.benchmarks.synthetic_spec import SyntheticSpec, build_synthetic_spec
+
+pytestmark = pytest.mark.benchmark
+
+SIZES = [10, 100, 1_000, 10_000]
+
+# Scaling checks compare sizes 10x apart: linear work grows ~10x, quadratic ~100x. The margin absorbs noise.
+MAX_GROWTH = 30
+
+
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """RESTClientGenerator always creates ``./clients/http``; keep it out of the working tree."""
+    monkeypatch.chdir(tmp_path)
+
+
+def best_of(func: Callable[[], Any], repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def report(stage: str, operations: int, seconds: float) -> None:
+    print(f"\n{stage:<32}{operations:>8} ops {seconds * 1000:>12.2f} ms")
+
+
+@cache
+def raw_spec(operations: int) -> dict[str, Any]:
+    return build_synthetic_spec(SyntheticSpec(operations))
+
+
+@cache
+def normalized_spec(operations: int) -> dict[str, Any]:
+    return SpecNormalizer().normalize(raw_spec(operations))
+
+
+@cache
+def parsed(operations: int) -> Parser:
+    return Parser(normalized_spec(operations), "synthetic")
+
+
+def assert_linear(stage: str, measure: Callable[[int], float], small: int, large: int) -> None:
+    small_time = measure(small)
+    large_time = measure(large)
+    growth = large_time / max(small_time, 1e-9)
+    print(f"\n{stage}: {small} -> {large} ops grew {growth:.1f}x")
+    assert growth < MAX_GROWTH, f"{stage} looks super-linear: {growth:.1f}x"
+
+
+@pytest.mark.parametrize("operations", SIZES)
+def test_normalize(operations: int) -> None:
+    spec = raw_spec(operations)
+    report("SpecNormalizer.normalize", operations, best_of(lambda: SpecNormalizer().normalize(spec)))
+
+
+@pytest.mark.parametrize("operations", SIZES)
+def test_parse(operations: int) -> None:
+    normalized_spec(operations)
+    start = time.perf_counter()
+    parser = parsed(operations)
+    report("Parser", operations, time.perf_counter() - start)
+    assert len(parser.operations) == operations
+
+
+@pytest.mark.parametrize("operations", SIZES)
+def test_generate_and_format(operations: int, tmp_path: Path) -> None:
+    parser = parsed(operations)
+    output = tmp_path / "clients"
+
+    start = time.perf_counter()
+    RESTClientGenerator(parser, base_path=output).generate()
+    report("RESTClientGenerator.generate", operations, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    format_file(str(output))
+    report("format_file", operations, time.perf_counter() - start)
+
+
+@pytest.mark.parametrize("transform", [ComponentSchemaPatcher, InlineSchemaExtractor])
+def test_patchers_scale_linearly(transform: type) -> None:
+    def measure(operations: int) -> float:
+        spec = raw_spec(operations)
+        return best_of(lambda: transform().patch(spec))
+
+    assert_linear(transform.__name__, measure, 1_000, 10_000)
+
+
+def test_tag_helpers_scale_linearly() -> None:
+    def measure(operations: int) -> float:
+        parser = parsed(operations)
+
+        def query_all_tags() -> None:
+            for tag in parser.apis:
+                parser.models_by_tag(tag)
+                for operation in parser.handlers_by_tag(tag):
+                    parser.get_operation_context(operation)
+
+        return best_of(query_all_tags, repeat=5)
+
+    assert_linear("tag helpers", measure, 100, 1_000)
@@ -1,5 +1,30 @@
+from pathlib import Path
+
 import pytest
 
+from restcodegen.generator.spec.cache import CACHE_DIR_ENV
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption("--run-benchmarks", action="store_true", default=False, help="Run tests marked as benchmark")
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if config.getoption("--run-benchmarks"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmarks run only with --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+@pytest.fixture(autouse=True)
+def isolated_user_cache(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keeps binary spec caches out of the real per-user cache directory."""
+    cache_dir = tmp_path_factory.mktemp("user-cache")
+    monkeypatch.setenv(CACHE_DIR_ENV, str(cache_dir))
+    return cache_dir
+
 
 @pytest.fixture()
 def sample_openapi_spec() -> dict:
@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import pytest
+
+from restcodegen.generator import batch
+from restcodegen.generator.batch import BatchConfigError, ServiceConfig, generate_all, load_batch_config
+from restcodegen.generator.spec.fetcher import FetchResult, SpecValidators
+from restcodegen.generator.spec.loader import SpecLoader
+
+MINIMAL_SPEC = Path(__file__).parent / "minimal_swagger.json"
+
+
+def write_config(tmp_path: Path, text: str) -> Path:
+    path = tmp_path / "restcodegen.toml"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_load_batch_config_applies_defaults(tmp_path: Path) -> None:
+    """Test that service tables inherit [defaults] and accept comma-separated tags."""
+    path = write_config(
+        tmp_path,
+        """
+[defaults]
+async = true
+output-dir = "generated"
+
+[[services]]
+name = "users"
+url = "tests/minimal_swagger.json"
+tags = "users,posts"
+
+[[services]]
+service-name = "billing"
+url = "https://example.com/openapi.json"
+async = false
+""",
+    )
+
+    config = load_batch_config(path)
+
+    assert config.services == [
+        ServiceConfig("users", "tests/minimal_swagger.json", ["users", "posts"], True, None, "generated"),
+        ServiceConfig("billing", "https://example.com/openapi.json", None, False, None, "generated"),
+    ]
+    assert config.output_dirs == ["generated"]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '[[services]]\nname = "users"\nurl = "spec.json"\ncolour = "red"\n',
+        '[[services]]\nname = "users"\n',
+        '[[services]]\nname = "users"\nurl = "a.json"\n[[services]]\nname = "users"\nurl = "b.json"\n',
+        "[defaults]\nasync = true\n",
+    ],
+)
+def test_load_batch_config_rejects_invalid_manifest(tmp_path: Path, text: str) -> None:
+    with pytest.raises(BatchConfigError):
+        load_batch_config(write_config(tmp_path, text))
+
+
+def test_generate_all_formats_each_output_dir_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that services are generated by a worker pool and the output is formatted once."""
+    formatted: list[str | None] = []
+    monkeypatch.setattr(batch, "format_file", formatted.append)
+    monkeypatch.setattr(SpecLoader, "BASE_PATH", tmp_path)
+    monkeypatch.chdir(tmp_path)
+    output_dir = str(tmp_path / "clients")
+    services = [ServiceConfig(name, str(MINIMAL_SPEC), output_dir=output_dir) for name in ("first", "second")]
+
+    generate_all(batch.BatchConfig(services), jobs=2)
+
+    assert formatted == [output_dir]
+    for name in ("first", "second"):
+        assert (tmp_path / "clients" / name / "models" / "api_models.py").exists()
+
+
+def test_generate_service_prunes_prefetched_spec(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a prefetched remote spec is pruned to the selected tags like a local one."""
+    monkeypatch.setattr(SpecLoader, "BASE_PATH", tmp_path)
+    monkeypatch.chdir(tmp_path)
+    service = ServiceConfig(
+        "remote", "https://example.invalid/swagger.json", api_tags=["Users"], output_dir=str(tmp_path / "clients")
+    )
+    prefetched = FetchResult(MINIMAL_SPEC.read_bytes(), SpecValidators())
+
+    batch.generate_service(service, prefetched)
+
+    models = (tmp_path / "clients" / "remote" / "models" / "api_models.py").read_text(encoding="utf-8")
+    assert "class User(" in models
+    assert "class Post(" not in models
+
+
+def test_generate_service_filters_prefetched_spec(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that include/exclude filters from the manifest apply to a prefetched remote spec."""
+    monkeypatch.setattr(SpecLoader, "BASE_PATH", tmp_path)
+    monkeypatch.chdir(tmp_path)
+    service = ServiceConfig(
+        "remote",
+        "https://example.invalid/swagger.json",
+        output_dir=str(tmp_path / "clients"),
+        include_paths=["/api/v4/*"],
+    )
+    prefetched = FetchResult(MINIMAL_SPEC.read_bytes(), SpecValidators())
+
+    batch.generate_service(service, prefetched)
+
+    apis = tmp_path / "clients" / "remote" / "apis"
+    assert (apis / "posts_api.py").exists()
+    assert not (apis / "users_api.py").exists()
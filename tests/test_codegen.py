@@ -1,11 +1,24 @@
+import asyncio
+import importlib
+import json
+import sys
+from collections.abc import Iterator
 from pathlib import Path
 
+import httpx
+import pydantic
 import pytest
 
 from restcodegen.generator.parser import Parser
 from restcodegen.generator.codegen import RESTClientGenerator
 
 
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """RESTClientGenerator always creates ``./clients/http``; keep it out of the working tree."""
+    monkeypatch.chdir(tmp_path)
+
+
 @pytest.fixture()
 def tmp_output(tmp_path: Path) -> Path:
     return tmp_path / "output"
@@ -70,3 +83,368 @@ def test_generate_creates_expected_files(tmp_output: Path, sample_openapi_spec:
     assert (root / "apis" / "users_api.py").exists()
     assert (root / "models" / "__init__.py").exists()
     assert (root / "models" / "api_models.py").exists()
+
+
+def test_incremental_generate_skips_unchanged_files(
+    tmp_output: Path, sample_openapi_spec: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    templates_dir = str(Path(__file__).parent.parent / "restcodegen" / "templates")
+    RESTClientGenerator(
+        Parser(sample_openapi_spec, "Dummy"), templates_dir=templates_dir, base_path=tmp_output, incremental=True
+    ).generate()
+    assert (tmp_output / "dummy" / ".restcodegen-manifest.json").exists()
+
+    calls: list[str] = []
+    monkeypatch.setattr(
+        "restcodegen.generator.codegen.create_and_write_file",
+        lambda file_path, text=None: calls.append(file_path.name),
+    )
+
+    RESTClientGenerator(
+        Parser(sample_openapi_spec, "Dummy"), templates_dir=templates_dir, base_path=tmp_output, incremental=True
+    ).generate()
+    assert calls == []
+
+    sample_openapi_spec["paths"]["/users"]["get"]["summary"] = "List users"
+    RESTClientGenerator(
+        Parser(sample_openapi_spec, "Dummy"), templates_dir=templates_dir, base_path=tmp_output, incremental=True
+    ).generate()
+    assert "users_api.py" in calls
+    assert "api_models.py" not in calls
+
+
+def test_parallel_generate_matches_serial(tmp_path: Path) -> None:
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Dummy", "version": "1.0.0"},
+        "paths": {
+            f"/items{index}": {
+                "get": {
+                    "operationId": f"getItems{index}",
+                    "tags": [f"tag{index}"],
+                    "responses": {
+                        "200": {
+                            "description": "OK",
+                            "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Item"}}},
+                        }
+                    },
+                }
+            }
+            for index in range(4)
+        },
+        "components": {"schemas": {"Item": {"type": "object", "properties": {"id": {"type": "integer"}}}}},
+    }
+    templates_dir = str(Path(__file__).parent.parent / "restcodegen" / "templates")
+    outputs: list[dict[str, bytes]] = []
+    for jobs in (1, 2):
+        RESTClientGenerator(
+            Parser(spec, "Dummy"), templates_dir=templates_dir, base_path=tmp_path, jobs=jobs
+        ).generate()
+        outputs.append({file.name: file.read_bytes() for file in (tmp_path / "dummy" / "apis").glob("*.py")})
+
+    assert len(outputs[0]) == 5
+    assert outputs[0] == outputs[1]
+
+
+def test_generate_serializes_spec_once(
+    tmp_output: Path, sample_openapi_spec: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[dict] = []
+    original_dumps = json.dumps
+
+    def counting_dumps(obj: object, *args: object, **kwargs: object) -> str:
+        if obj is sample_openapi_spec:
+            calls.append(obj)
+        return original_dumps(obj, *args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(json, "dumps", counting_dumps)
+    parser = Parser(sample_openapi_spec, "Dummy")
+    RESTClientGenerator(parser, base_path=tmp_output).generate()
+
+    assert len(calls) == 1
+    assert (tmp_output / "dummy" / "models" / "api_models.py").read_text(encoding="utf-8")
+
+
+@pytest.fixture()
+def tagged_openapi_spec() -> dict:
+    def operation(tag: str, schema: str) -> dict:
+        return {
+            "tags": [tag],
+            "responses": {
+                "200": {
+                    "description": "OK",
+                    "content": {"application/json": {"schema": {"$ref": f"#/components/schemas/{schema}"}}},
+                }
+            },
+        }
+
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Dummy", "version": "1.0.0"},
+        "paths": {
+            "/pets": {"get": operation("pets", "Pet")},
+            "/orders": {
+                "get": operation("orders", "Order"),
+                "post": {
+                    **operation("orders", "Order"),
+                    "requestBody": {
+                        "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Order"}}}
+                    },
+                },
+            },
+        },
+        "components": {
+            "schemas": {
+                "Owner": {"type": "object", "properties": {"name": {"type": "string"}}},
+                "Pet": {"type": "object", "properties": {"owner": {"$ref": "#/components/schemas/Owner"}}},
+                "Order": {
+                    "type": "object",
+                    "properties": {
+                        "owner": {"$ref": "#/components/schemas/Owner"},
+                        "items": {"type": "array", "items": {"$ref": "#/components/schemas/OrderItem"}},
+                    },
+                },
+                "OrderItem": {
+                    "type": "object",
+                    "properties": {"sku": {"type": "string"}, "unitPrice": {"type": "number"}},
+                },
+            }
+        },
+    }
+
+
+@pytest.fixture()
+def importable_output(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Generates into ``<tmp_path>/out`` and makes it importable as the ``out`` package."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield Path("out")
+    for name in [module for module in sys.modules if module == "out" or module.startswith("out.")]:
+        del sys.modules[name]
+
+
+def test_tag_models_layout_imports_only_needed_models(importable_output: Path, tagged_openapi_spec: dict) -> None:
+    RESTClientGenerator(
+        Parser(tagged_openapi_spec, "Dummy"), base_path=importable_output, models_layout="tag"
+    ).generate()
+
+    models = importable_output / "dummy" / "models"
+    assert "class OrderItem" in (models / "orders_models.py").read_text(encoding="utf-8")
+    assert "class Owner" in (models / "common_models.py").read_text(encoding="utf-8")
+    pets_api = (importable_output / "dummy" / "apis" / "pets_api.py").read_text(encoding="utf-8")
+    assert "out.dummy.models.pets_models import" in pets_api
+    assert "orders_models" not in pets_api
+
+    pets_models = importlib.import_module("out.dummy.models.pets_models")
+    assert pets_models.Pet.model_validate({"owner": {"name": "Alice"}}).owner.name == "Alice"
+
+    api_models = importlib.import_module("out.dummy.models.api_models")
+    assert api_models.OrderItem(sku="A1").sku == "A1"
+
+
+def test_tag_models_layout_reserves_facade_module(importable_output: Path, tagged_openapi_spec: dict) -> None:
+    """Test that an ``api`` tag does not overwrite the ``api_models`` facade."""
+    tagged_openapi_spec["paths"]["/pets"]["get"]["tags"] = ["api"]
+    RESTClientGenerator(
+        Parser(tagged_openapi_spec, "Dummy"), base_path=importable_output, models_layout="tag"
+    ).generate()
+
+    assert "class Pet" in (importable_output / "dummy" / "models" / "api_models_tag.py").read_text(encoding="utf-8")
+    assert importlib.import_module("out.dummy").ApiApi.__name__ == "ApiApi"
+    api_models = importlib.import_module("out.dummy.models.api_models")
+    assert api_models.Pet.model_validate({"owner": {"name": "Alice"}}).owner.name == "Alice"
+
+
+def test_incremental_tag_layout_follows_model_moves(importable_output: Path, tagged_openapi_spec: dict) -> None:
+    """Test that retagging operations regenerates the split models and removes modules that became empty."""
+    RESTClientGenerator(
+        Parser(tagged_openapi_spec, "Dummy"), base_path=importable_output, models_layout="tag", incremental=True
+    ).generate()
+    models = importable_output / "dummy" / "models"
+    assert (models / "pets_models.py").exists()
+
+    schema = tagged_openapi_spec["paths"]["/pets"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    schema["$ref"] = "#/components/schemas/OrderItem"
+    RESTClientGenerator(
+        Parser(tagged_openapi_spec, "Dummy"), base_path=importable_output, models_layout="tag", incremental=True
+    ).generate()
+
+    assert not (models / "pets_models.py").exists()
+    assert "class OrderItem" in (models / "common_models.py").read_text(encoding="utf-8")
+    assert importlib.import_module("out.dummy.apis.pets_api").PetsApi.__name__ == "PetsApi"
+
+
+def test_lazy_exports_import_apis_on_first_access(importable_output: Path, tagged_openapi_spec: dict) -> None:
+    RESTClientGenerator(
+        Parser(tagged_openapi_spec, "Dummy"), base_path=importable_output, models_layout="tag", lazy_exports=True
+    ).generate()
+
+    package = importlib.import_module("out.dummy")
+    assert sorted(package.__all__) == ["OrdersApi", "PetsApi"]
+    assert "out.dummy.apis.pets_api" not in sys.modules
+
+    assert package.PetsApi.__name__ == "PetsApi"
+    assert "out.dummy.apis.pets_api" in sys.modules
+    assert "out.dummy.models.orders_models" not in sys.modules
+    with pytest.raises(AttributeError):
+        package.MissingApi  # noqa: B018
+
+
+def test_lazy_exports_without_apis(importable_output: Path, tagged_openapi_spec: dict) -> None:
+    tagged_openapi_spec["paths"] = {}
+    RESTClientGenerator(Parser(tagged_openapi_spec, "Dummy"), base_path=importable_output, lazy_exports=True).generate()
+
+    package = importlib.import_module("out.dummy")
+    assert package.__all__ == []
+
+
+def test_generated_client_validates_bytes_and_skips_empty_bodies(
+    importable_output: Path, tagged_openapi_spec: dict
+) -> None:
+    tagged_openapi_spec["paths"]["/pets"]["get"]["responses"]["204"] = {"description": "No pets"}
+    RESTClientGenerator(Parser(tagged_openapi_spec, "Dummy"), base_path=importable_output).generate()
+    pets_api = importlib.import_module("out.dummy.apis.pets_api")
+
+    responses = iter(
+        [httpx.Response(200, content=b'{"owner": {"name": "Alice"}}'), httpx.Response(204), httpx.Response(404)]
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return next(responses)
+
+    with httpx.Client(base_url="http://test", transport=httpx.MockTransport(handler)) as client:
+        api = pets_api.PetsApi(client)
+        assert api.get_pets().owner.name == "Alice"
+        assert api.get_pets() is None
+        # Пустое тело ошибки не должно выглядеть как успешный ответ без содержимого.
+        with pytest.raises(pydantic.ValidationError):
+            api.get_pets()
+
+
+def test_generated_client_serializes_request_bodies(importable_output: Path, tagged_openapi_spec: dict) -> None:
+    RESTClientGenerator(Parser(tagged_openapi_spec, "Dummy"), base_path=importable_output).generate()
+    orders_api = importlib.import_module("out.dummy.apis.orders_api")
+    api_models = importlib.import_module("out.dummy.models.api_models")
+    sent: list[bytes] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request.content)
+        return httpx.Response(200, content=request.content)
+
+    order = api_models.Order(items=[api_models.OrderItem(sku="A1", unitPrice=2.5)])
+    with httpx.Client(base_url="http://test", transport=httpx.MockTransport(handler)) as client:
+        assert orders_api.OrdersApi(client).post_orders(order) == order
+
+    assert json.loads(sent[0]) == {"items": [{"sku": "A1", "unitPrice": 2.5}]}
+
+
+def test_generated_client_survives_colliding_model_names(importable_output: Path, tagged_openapi_spec: dict) -> None:
+    """Test that models whose names collide after snake-casing, or with helper imports, keep separate validators."""
+    schemas = tagged_openapi_spec["components"]["schemas"]
+    schemas["UserDTO"] = {"type": "object", "properties": {"login": {"type": "string"}}}
+    schemas["UserDto"] = {"type": "object", "properties": {"email": {"type": "string"}}}
+    schemas["TypeAdapter"] = {"type": "object", "properties": {"kind": {"type": "string"}}}
+    pets = tagged_openapi_spec["paths"]["/pets"]["get"]
+    for path, schema in (("/users/legacy", "UserDTO"), ("/users", "UserDto"), ("/adapters", "TypeAdapter")):
+        response = {
+            "description": "OK",
+            "content": {"application/json": {"schema": {"$ref": f"#/components/schemas/{schema}"}}},
+        }
+        tagged_openapi_spec["paths"][path] = {"get": {**pets, "responses": {"200": response}}}
+    RESTClientGenerator(Parser(tagged_openapi_spec, "Dummy"), base_path=importable_output).generate()
+    pets_api = importlib.import_module("out.dummy.apis.pets_api")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b'{"login": "alice", "email": "a@example.com", "kind": "json"}')
+
+    with httpx.Client(base_url="http://test", transport=httpx.MockTransport(handler)) as client:
+        api = pets_api.PetsApi(client)
+        assert type(api.get_users_legacy()).__name__ == "UserDTO"
+        assert type(api.get_users()).__name__ == "UserDto"
+        assert api.get_adapters().kind == "json"
+
+
+def test_msgspec_backend_decodes_with_msgspec(importable_output: Path, tagged_openapi_spec: dict) -> None:
+    parser = Parser(tagged_openapi_spec, "Dummy", model_backend="msgspec")
+    RESTClientGenerator(parser, base_path=importable_output).generate()
+
+    orders_api_source = (importable_output / "dummy" / "apis" / "orders_api.py").read_text(encoding="utf-8")
+    assert "msgspec.json.Decoder(Order).decode" in orders_api_source
+    assert "TypeAdapter" not in orders_api_source
+
+    pytest.importorskip("msgspec")
+    orders_api = importlib.import_module("out.dummy.apis.orders_api")
+    api_models = importlib.import_module("out.dummy.models.api_models")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=request.content)
+
+    order = api_models.Order(items=[api_models.OrderItem(sku="A1")])
+    with httpx.Client(base_url="http://test", transport=httpx.MockTransport(handler)) as client:
+        assert orders_api.OrdersApi(client).post_orders(order) == order
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"items": [{"sku": "A1"}]}',
+        memoryview(b'{"items": [{"sku": "A1"}]}'),
+        {"items": [{"sku": "A1"}]},
+    ],
+    ids=["bytes", "memoryview", "mapping"],
+)
+def test_generated_client_accepts_raw_request_bodies(
+    importable_output: Path, tagged_openapi_spec: dict, body: object
+) -> None:
+    RESTClientGenerator(Parser(tagged_openapi_spec, "Dummy"), base_path=importable_output).generate()
+    orders_api = importlib.import_module("out.dummy.apis.orders_api")
+    sent: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        return httpx.Response(200, content=request.read())
+
+    with httpx.Client(base_url="http://test", transport=httpx.MockTransport(handler)) as client:
+        order = orders_api.OrdersApi(client).post_orders(body)
+
+    assert order.items[0].sku == "A1"
+    assert json.loads(sent[0].content) == {"items": [{"sku": "A1"}]}
+    assert sent[0].headers["Content-Type"] == "application/json"
+    assert sent[0].headers["Content-Length"] == str(len(sent[0].content))
+
+
+def test_async_client_streams_memoryview_bodies(importable_output: Path, tagged_openapi_spec: dict) -> None:
+    RESTClientGenerator(Parser(tagged_openapi_spec, "Dummy"), base_path=importable_output, async_mode=True).generate()
+    orders_api = importlib.import_module("out.dummy.apis.orders_api")
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=await request.aread())
+
+    async def post() -> object:
+        body = memoryview(b'{"items": [{"sku": "A1"}]}')
+        async with httpx.AsyncClient(base_url="http://test", transport=httpx.MockTransport(handler)) as client:
+            return await orders_api.OrdersApi(client).post_orders(body)
+
+    assert asyncio.run(post()).items[0].sku == "A1"
+
+
+def test_async_client_with_models_named_like_helpers(importable_output: Path, tagged_openapi_spec: dict) -> None:
+    """Test that schemas named after ``collections.abc`` types do not shadow the request body helpers."""
+    schemas = tagged_openapi_spec["components"]["schemas"]
+    schemas["Mapping"] = {"type": "object", "properties": {"key": {"type": "string"}}}
+    schemas["AsyncIterator"] = {"type": "object", "properties": {"key": {"type": "string"}}}
+    post = tagged_openapi_spec["paths"]["/orders"]["post"]
+    post["requestBody"]["content"]["application/json"]["schema"]["$ref"] = "#/components/schemas/Mapping"
+    post["responses"]["200"]["content"]["application/json"]["schema"]["$ref"] = "#/components/schemas/AsyncIterator"
+    RESTClientGenerator(Parser(tagged_openapi_spec, "Dummy"), base_path=importable_output, async_mode=True).generate()
+    orders_api = importlib.import_module("out.dummy.apis.orders_api")
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=await request.aread())
+
+    async def post_orders(body: object) -> object:
+        async with httpx.AsyncClient(base_url="http://test", transport=httpx.MockTransport(handler)) as client:
+            return await orders_api.OrdersApi(client).post_orders(body)
+
+    assert asyncio.run(post_orders({"key": "dict"})).key == "dict"
+    assert asyncio.run(post_orders(memoryview(b'{"key": "view"}'))).key == "view"
@@ -1,4 +1,11 @@
+import json
+from pathlib import Path
+
+import pytest
+
 from restcodegen.generator.parser import Parser
+from restcodegen.generator.spec.loader import SpecLoader
+from restcodegen.generator.spec.pruner import OperationFilter
 
 
 def test_parser_initialization(sample_openapi_spec: dict) -> None:
@@ -94,3 +101,88 @@ def test_parser_with_remote_petstore_spec() -> None:
     assert parser.openapi_version.startswith("3.")
     assert "pet" in parser.apis
     assert parser.handlers_by_tag("pet")
+
+
+def test_handlers_by_method_and_path(sample_openapi_spec: dict) -> None:
+    """Test method and path lookups served from the parse-time indexes."""
+
+    parser = Parser(sample_openapi_spec, "test_service")
+
+    get_handlers = parser.handlers_by_method("GET")
+    assert {h.operation.operationId for h in get_handlers} == {"getUsers", "getPosts"}
+    assert [h.operation.operationId for h in parser.handlers_by_method("post")] == ["createUser"]
+    assert parser.handlers_by_method("delete") == []
+
+    users_handlers = parser.handler_by_path("/users")
+    assert {h.method for h in users_handlers} == {"get", "post"}
+    assert parser.handler_by_path("/missing") == []
+
+
+def test_lookups_return_copies(sample_openapi_spec: dict) -> None:
+    """Test that mutating lookup results does not corrupt the parser indexes."""
+
+    parser = Parser(sample_openapi_spec, "test_service")
+
+    parser.handlers_by_tag("users").clear()
+    parser.models_by_tag("users").clear()
+
+    assert len(parser.handlers_by_tag("users")) == 2
+    assert "User" in parser.models_by_tag("users")
+
+
+def test_from_source_restores_cached_state(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, sample_openapi_spec: dict
+) -> None:
+    """Test that an unchanged spec restores the parsed state instead of parsing again."""
+    monkeypatch.setattr(SpecLoader, "BASE_PATH", tmp_path)
+    spec_file = tmp_path / "openapi.json"
+    spec_file.write_text(json.dumps(sample_openapi_spec))
+    parser = Parser.from_source(str(spec_file), "test_service")
+
+    def fail(self: Parser) -> None:
+        raise AssertionError("spec was parsed again")
+
+    monkeypatch.setattr(Parser, "parse", fail)
+    cached = Parser.from_source(str(spec_file), "test_service", selected_tags=["posts"], prune=False)
+
+    assert cached.service_name == "test_service"
+    assert cached.apis == {"posts"}
+    assert cached.models_source == parser.models_source
+    assert cached.handlers_by_tag("users")[0].path == "/users"
+
+
+def test_from_source_prunes_unselected_tags(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, sample_openapi_spec: dict
+) -> None:
+    """Test that selecting tags drops unreachable operations and schemas before model generation."""
+    monkeypatch.setattr(SpecLoader, "BASE_PATH", tmp_path)
+    spec_file = tmp_path / "openapi.json"
+    spec_file.write_text(json.dumps(sample_openapi_spec))
+
+    parser = Parser.from_source(str(spec_file), "test_service", selected_tags=["users"])
+
+    assert parser.all_tags == {"users"}
+    assert "class User(" in parser.models_source
+    assert "class Post(" not in parser.models_source
+
+
+def test_from_source_rejects_operation_filter_without_pruning() -> None:
+    """Test that an operation filter is not silently ignored when pruning is disabled."""
+    with pytest.raises(ValueError, match="prune"):
+        Parser.from_source("openapi.json", "test_service", prune=False, operation_filter=OperationFilter(("/users",)))
+
+
+def test_msgspec_backend_is_cached_separately(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, sample_openapi_spec: dict
+) -> None:
+    """Test that the msgspec backend emits structs and does not reuse the cached pydantic state."""
+    monkeypatch.setattr(SpecLoader, "BASE_PATH", tmp_path)
+    spec_file = tmp_path / "openapi.json"
+    spec_file.write_text(json.dumps(sample_openapi_spec))
+
+    pydantic_parser = Parser.from_source(str(spec_file), "test_service")
+    msgspec_parser = Parser.from_source(str(spec_file), "test_service", model_backend="msgspec")
+
+    assert "class User(BaseModel)" in pydantic_parser.models_source
+    assert "class User(Struct, omit_defaults=True)" in msgspec_parser.models_source
+    assert msgspec_parser.model_backend == "msgspec"
@@ -0,0 +1,44 @@
+import json
+from pathlib import Path
+
+from restcodegen.generator.parser import Parser
+from restcodegen.generator.profiling import Profiler, profiling, stage
+
+
+def test_stage_is_noop_without_profiler() -> None:
+    with stage("idle"):
+        pass
+
+
+def test_nested_stage_peak_includes_children() -> None:
+    """Test that a parent's peak memory covers allocations made inside nested stages."""
+    with profiling() as profiler:
+        with stage("outer"):
+            with stage("inner"):
+                blob = bytearray(2 * 1024 * 1024)
+            del blob
+
+    records = {record.name: record for record in profiler.records}
+    assert records["inner"].depth == 1
+    assert records["outer"].depth == 0
+    assert records["inner"].peak_memory is not None and records["inner"].peak_memory >= 2 * 1024 * 1024
+    assert records["outer"].peak_memory is not None and records["outer"].peak_memory >= records["inner"].peak_memory
+    assert records["outer"].duration >= records["inner"].duration
+
+
+def test_profile_pipeline_outputs(tmp_path: Path, sample_openapi_spec: dict) -> None:
+    """Test that parser stages are recorded and exported as a table, JSON and a Chrome trace."""
+    with profiling(Profiler(trace_memory=False)) as profiler:
+        Parser(sample_openapi_spec, "test_service")
+
+    names = [item.name for item in profiler.summary()]
+    assert {"parse.init", "parse.models", "parse.operations"} <= set(names)
+    assert "parse.models" in profiler.format_table()
+
+    profiler.write(tmp_path / "profile.json")
+    assert json.loads((tmp_path / "profile.json").read_text())["summary"][0]["name"] == names[0]
+
+    profiler.write(tmp_path / "trace.json", "chrome")
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert {event["ph"] for event in events} == {"X"}
+    assert [event["name"] for event in events][0] == "parse.init"
@@ -0,0 +1,69 @@
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from restcodegen.generator.spec.fetcher import (
+    AsyncSpecFetcher,
+    FetchResult,
+    PrefetchedSpecFetcher,
+    SpecFetchError,
+    SpecValidators,
+    content_hash,
+)
+from restcodegen.generator.spec.loader import SpecLoader
+
+
+def test_fetch_many_bounds_concurrency_and_keeps_order() -> None:
+    """Test that specs are fetched concurrently over one client, at most max_concurrency at a time."""
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=request.url.path.encode(), headers={"ETag": '"v1"'})
+
+    async def fetch() -> list[FetchResult | SpecFetchError]:
+        async with AsyncSpecFetcher(max_concurrency=3, transport=httpx.MockTransport(handler)) as fetcher:
+            requests: list[tuple[str, SpecValidators | None]] = [
+                (f"http://gateway/spec{index}", None) for index in range(8)
+            ]
+            requests.append(("http://gateway/missing", None))
+            requests.append(("http://gateway/cached", SpecValidators(etag='"v1"', content_hash="abc")))
+            return await fetcher.fetch_many(requests)
+
+    results = asyncio.run(fetch())
+
+    assert peak == 3
+    assert [result.content for result in results[:8]] == [f"/spec{index}".encode() for index in range(8)]
+    assert isinstance(results[8], SpecFetchError)
+    assert isinstance(results[9], FetchResult)
+    assert results[9].not_modified
+    assert results[9].validators.content_hash == "abc"
+
+
+def test_loader_uses_prefetched_result(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a prefetched response is consumed by SpecLoader without another request."""
+    monkeypatch.setattr(SpecLoader, "BASE_PATH", tmp_path)
+    body = json.dumps({"openapi": "3.0.0", "info": {"title": "Test", "version": "1.0.0"}, "paths": {}}).encode()
+    url = "http://gateway/openapi.json"
+    result = FetchResult(body, SpecValidators(etag='"v1"', content_hash=content_hash(body)))
+
+    def fail(request: httpx.Request) -> httpx.Response:
+        raise AssertionError("unexpected request")
+
+    fetcher = PrefetchedSpecFetcher({url: result}, transport=httpx.MockTransport(fail))
+    spec = SpecLoader(url, "test_service", fetcher=fetcher).open()
+
+    assert spec["info"]["title"] == "Test"
+    assert (tmp_path / "schemas" / "test_service.json").read_bytes() == body
@@ -1,6 +1,15 @@
+import json
+from pathlib import Path
+
+import httpx
 import pytest
 
+from restcodegen.generator.spec import loader as loader_module
+from restcodegen.generator.spec.fetcher import SpecFetcher
 from restcodegen.generator.spec.loader import SpecLoader
+from restcodegen.generator.spec.normalizer import SpecNormalizer
+from restcodegen.generator.spec.patchers import ComponentSchemaPatcher
+from restcodegen.generator.spec.source import load_json, map_file
 
 
 @pytest.fixture
@@ -45,3 +54,142 @@ def test_open_all_sources_fail() -> None:
     with pytest.raises(FileNotFoundError):
         loader = SpecLoader("not_available.json", "not_available")
         loader.open()
+
+
+def test_open_reuses_normalized_spec_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, sample_spec: dict) -> None:
+    """Test that an unchanged spec is served from the normalized cache and a changed one is renormalized."""
+    monkeypatch.setattr(SpecLoader, "BASE_PATH", tmp_path)
+    spec_file = tmp_path / "openapi.json"
+    spec_file.write_text(json.dumps(sample_spec))
+
+    first = SpecLoader(str(spec_file), "test_service").open()
+
+    def fail(self: SpecNormalizer, spec: dict) -> dict:
+        raise AssertionError("spec was normalized again")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(SpecNormalizer, "normalize", fail)
+        assert SpecLoader(str(spec_file), "test_service").open() == first
+
+    sample_spec["info"]["version"] = "2.0.0"
+    spec_file.write_text(json.dumps(sample_spec))
+    assert SpecLoader(str(spec_file), "test_service").open()["info"]["version"] == "2.0.0"
+
+
+def test_binary_caches_stay_out_of_client_tree(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, sample_spec: dict, isolated_user_cache: Path
+) -> None:
+    """Test that pickled artifacts are written to the per-user cache, not next to the generated clients."""
+    monkeypatch.setattr(SpecLoader, "BASE_PATH", tmp_path / "clients")
+    spec_file = tmp_path / "openapi.json"
+    spec_file.write_text(json.dumps(sample_spec))
+
+    loader = SpecLoader(str(spec_file), "test_service")
+    loader.open()
+
+    assert loader.normalized_cache is not None
+    assert loader.normalized_cache.path.exists()
+    assert loader.normalized_cache.path.is_relative_to(isolated_user_cache)
+    assert not list((tmp_path / "clients").rglob("*.pickle"))
+
+
+def test_conditional_get_reuses_cached_spec(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, sample_spec: dict) -> None:
+    """Test that validators are replayed and the cached copy is only rewritten when the content changes."""
+    monkeypatch.setattr(SpecLoader, "BASE_PATH", tmp_path)
+    body = json.dumps(sample_spec).encode()
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=body, headers={"ETag": '"v2"' if len(requests) > 2 else '"v1"'})
+
+    def open_spec() -> dict:
+        fetcher = SpecFetcher(transport=httpx.MockTransport(handler))
+        return SpecLoader("http://example.com/openapi.json", "test_service", fetcher=fetcher).open()
+
+    first = open_spec()
+    cache_file = tmp_path / "schemas" / "test_service.json"
+    meta_file = tmp_path / "schemas" / "test_service.meta.json"
+    assert cache_file.read_bytes() == body
+    assert json.loads(meta_file.read_text())["etag"] == '"v1"'
+
+    writes: list[bytes] = []
+    monkeypatch.setattr(SpecLoader, "_write_cache", lambda self, content: writes.append(content))
+    assert open_spec() == first
+    assert requests[-1].headers["If-None-Match"] == '"v1"'
+
+    meta_file.write_text(
+        json.dumps({"etag": '"stale"', "content_hash": json.loads(meta_file.read_text())["content_hash"]})
+    )
+    assert open_spec() == first
+    assert writes == []
+    assert json.loads(meta_file.read_text())["etag"] == '"v2"'
+
+
+def test_load_json_from_mapped_file(tmp_path: Path) -> None:
+    """Test that mapped specs are parsed, including input orjson rejects (BOM, integers beyond 64 bits)."""
+    spec_file = tmp_path / "openapi.json"
+    spec_file.write_bytes(b'\xef\xbb\xbf{"openapi": "3.0.0", "x-max": 123456789012345678901234567890}')
+
+    with map_file(spec_file) as content:
+        assert load_json(content) == {"openapi": "3.0.0", "x-max": 123456789012345678901234567890}
+
+
+def test_open_yaml_spec_reuses_decoded_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that YAML specs load with dates kept as strings and are decoded only once per content."""
+    monkeypatch.setattr(SpecLoader, "BASE_PATH", tmp_path)
+    spec_file = tmp_path / "openapi.yaml"
+    spec_file.write_text(
+        """
+openapi: 3.0.0
+info:
+  title: YAML API
+  version: 2024-01-31
+paths:
+  /test:
+    get:
+      operationId: getTest
+      responses:
+        200:
+          description: OK
+""",
+        encoding="utf-8",
+    )
+
+    spec = SpecLoader(str(spec_file), "test_service").open()
+    assert spec["info"]["version"] == "2024-01-31"
+    assert "200" in spec["paths"]["/test"]["get"]["responses"]
+
+    def fail(content: bytes) -> dict:
+        raise AssertionError("YAML was parsed again")
+
+    monkeypatch.setattr(loader_module, "load_yaml", fail)
+    normalizer = SpecNormalizer([ComponentSchemaPatcher()])
+    assert SpecLoader(str(spec_file), "test_service", normalizer=normalizer).open()["info"]["title"] == "YAML API"
+
+
+def test_remote_yaml_spec_is_cached_as_json(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a downloaded YAML spec is stored as JSON in ``<service>.json`` and served from it on 304."""
+    monkeypatch.setattr(SpecLoader, "BASE_PATH", tmp_path)
+    body = b"openapi: 3.0.0\ninfo:\n  title: YAML API\n  version: 2024-01-31\npaths: {}\n"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=body, headers={"ETag": '"v1"'})
+
+    def open_spec() -> dict:
+        fetcher = SpecFetcher(transport=httpx.MockTransport(handler))
+        return SpecLoader("http://example.com/openapi.yaml", "test_service", fetcher=fetcher, use_cache=False).open()
+
+    assert open_spec()["info"]["version"] == "2024-01-31"
+    cached = json.loads((tmp_path / "schemas" / "test_service.json").read_bytes())
+    assert cached["info"] == {"title": "YAML API", "version": "2024-01-31"}
+
+    def fail(content: bytes) -> dict:
+        raise AssertionError("cached copy is not JSON")
+
+    monkeypatch.setattr(loader_module, "load_yaml", fail)
+    assert open_spec()["info"]["title"] == "YAML API"
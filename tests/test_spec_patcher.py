@@ -1,6 +1,10 @@
 import json
+import sys
+from typing import Any
+
 import pytest
 
+from restcodegen.generator.spec import SpecNormalizer
 from restcodegen.generator.spec.patchers import (
     ComponentSchemaPatcher,
     InlineSchemaExtractor,
@@ -266,3 +270,74 @@ def test_idempotent_patching(simple_swagger_schema: dict) -> None:
     json_twice = json.dumps(patched_twice, sort_keys=True)
 
     assert json_once == json_twice
+
+
+def test_replace_dots_in_nested_refs_without_mutating_input(schema_with_dots: dict) -> None:
+    """Test that refs deep inside schemas are renamed and the source spec is left untouched."""
+    schema_with_dots["components"]["schemas"]["User.List"] = {
+        "type": "array",
+        "items": {"$ref": "#/components/schemas/User.Profile"},
+        "discriminator": {"mapping": {"profile": "#/components/schemas/User.Profile"}},
+    }
+    original = json.dumps(schema_with_dots, sort_keys=True)
+
+    patched = ComponentSchemaPatcher().patch(schema_with_dots)
+
+    assert json.dumps(schema_with_dots, sort_keys=True) == original
+    user_list = patched["components"]["schemas"]["UserList"]
+    assert user_list["items"]["$ref"] == "#/components/schemas/UserProfile"
+    assert user_list["discriminator"]["mapping"]["profile"] == "#/components/schemas/UserProfile"
+
+
+def test_extract_in_place(simple_swagger_schema: dict) -> None:
+    """Test that in-place extraction patches the given spec instead of a copy."""
+    patched = InlineSchemaExtractor(in_place=True).patch(simple_swagger_schema)
+
+    assert patched is simple_swagger_schema
+    assert "create_post_request_body" in simple_swagger_schema["components"]["schemas"]
+
+
+def test_extract_deeply_nested_objects() -> None:
+    """Test that nesting deeper than the recursion limit is extracted without recursion."""
+    depth = sys.getrecursionlimit() + 100
+    root: dict = {"type": "object", "properties": {}}
+    node = root
+    for _ in range(depth):
+        child: dict = {"type": "object", "properties": {}}
+        node["properties"]["child"] = child
+        node = child
+
+    spec = {"openapi": "3.0.0", "paths": {}, "components": {"schemas": {"Root": root}}}
+    patched = InlineSchemaExtractor(in_place=True).patch(spec)
+
+    schemas = patched["components"]["schemas"]
+    assert len(schemas) == depth + 1
+    assert schemas["Root"]["properties"]["child"] == {"$ref": "#/components/schemas/Root_child"}
+
+
+class DescriptionStripper:
+    def __init__(self) -> None:
+        self.walks = 0
+
+    def prepare(self, spec: dict) -> None:
+        self.walks += 1
+
+    def visit(self, node: Any, path: tuple) -> Any:
+        if isinstance(node, dict) and "description" in node:
+            return {key: value for key, value in node.items() if key != "description"}
+        return node
+
+
+def test_normalizer_fuses_visitors_into_one_walk(schema_with_dots: dict) -> None:
+    """Test that visitor transforms share a walk and only copy the branches they change."""
+    schema_with_dots["info"] = {"title": "Test API", "description": "dropped"}
+    original = json.dumps(schema_with_dots, sort_keys=True)
+    stripper = DescriptionStripper()
+
+    normalized = SpecNormalizer([ComponentSchemaPatcher(), stripper]).normalize(schema_with_dots)
+
+    assert stripper.walks == 1
+    assert json.dumps(schema_with_dots, sort_keys=True) == original
+    assert normalized["info"] == {"title": "Test API"}
+    profile = normalized["components"]["schemas"]["UserProfile"]
+    assert profile["properties"] is schema_with_dots["components"]["schemas"]["User.Profile"]["properties"]
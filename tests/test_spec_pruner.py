@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from restcodegen.generator.spec.pruner import OperationFilter, OperationFilterError, SpecPruner
+
+
+def operation(tag: str, schema: str) -> dict:
+    return {
+        "tags": [tag],
+        "responses": {
+            "200": {"description": "OK", "content": {"application/json": {"schema": {"$ref": schema}}}},
+        },
+    }
+
+
+@pytest.fixture
+def monolith_spec() -> dict:
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Monolith", "version": "1.0.0"},
+        "paths": {
+            "/pets": {
+                "parameters": [{"$ref": "#/components/parameters/Tenant"}],
+                "get": operation("pets.v1", "#/components/schemas/PetList"),
+                "post": operation("orders", "#/components/schemas/Order"),
+            },
+            "/orders": {"get": operation("orders", "#/components/schemas/Order")},
+        },
+        "components": {
+            "parameters": {
+                "Tenant": {"name": "tenant", "in": "header", "schema": {"$ref": "#/components/schemas/TenantId"}},
+            },
+            "schemas": {
+                "TenantId": {"type": "string"},
+                "PetList": {"type": "array", "items": {"$ref": "#/components/schemas/Pet"}},
+                "Pet": {
+                    "type": "object",
+                    "properties": {"kind": {"type": "string"}},
+                    "discriminator": {"propertyName": "kind", "mapping": {"cat": "Cat"}},
+                },
+                "Cat": {"allOf": [{"$ref": "#/components/schemas/Pet"}]},
+                "Dog": {"allOf": [{"$ref": "#/components/schemas/Pet"}]},
+                "Order": {"type": "object", "properties": {"pet": {"$ref": "#/components/schemas/Pet"}}},
+            },
+            "securitySchemes": {"token": {"type": "http", "scheme": "bearer"}},
+        },
+    }
+
+
+def test_prune_keeps_ref_closure_of_selected_tags(monolith_spec: dict) -> None:
+    """Test that only the selected operations and components they reach survive, matching dot-stripped tags."""
+    original = json.dumps(monolith_spec, sort_keys=True)
+
+    pruned = SpecPruner(["petsv1"]).prune(monolith_spec)
+
+    assert json.dumps(monolith_spec, sort_keys=True) == original
+    assert list(pruned["paths"]) == ["/pets"]
+    assert set(pruned["paths"]["/pets"]) == {"parameters", "get"}
+    assert set(pruned["components"]["schemas"]) == {"TenantId", "PetList", "Pet", "Cat", "Dog"}
+    assert set(pruned["components"]["parameters"]) == {"Tenant"}
+    assert pruned["components"]["securitySchemes"] == monolith_spec["components"]["securitySchemes"]
+
+
+def test_prune_without_matching_tags_keeps_spec(monolith_spec: dict) -> None:
+    assert SpecPruner(["unknown"]).prune(monolith_spec) is monolith_spec
+
+
+@pytest.mark.parametrize(
+    "operation_filter",
+    [OperationFilter(include_operation_ids=("typo",)), OperationFilter(exclude_paths=("/*",))],
+)
+def test_prune_rejects_filter_without_matches(monolith_spec: dict, operation_filter: OperationFilter) -> None:
+    """Test that a filter selecting nothing fails instead of falling back to the whole spec."""
+    with pytest.raises(OperationFilterError, match="No operation matches"):
+        SpecPruner(["petsv1"], operation_filter).prune(monolith_spec)
+
+
+@pytest.mark.parametrize(
+    ("operation_filter", "expected"),
+    [
+        (OperationFilter(include_paths=("/ord*",)), {"/orders": {"get"}}),
+        (OperationFilter(exclude_methods=("GET",)), {"/pets": {"parameters", "post"}}),
+        (OperationFilter(include_operation_ids=("listOrders",)), {"/orders": {"get"}}),
+        (
+            OperationFilter(include_paths=("/*",), exclude_operation_ids=("listOrders",)),
+            {"/pets": {"parameters", "get", "post"}},
+        ),
+    ],
+)
+def test_prune_by_operation_filter(monolith_spec: dict, operation_filter: OperationFilter, expected: dict) -> None:
+    """Test that path globs, operationIds and methods select operations and prune unreachable schemas."""
+    monolith_spec["paths"]["/orders"]["get"]["operationId"] = "listOrders"
+
+    pruned = SpecPruner(operation_filter=operation_filter).prune(monolith_spec)
+
+    assert {path: set(item) for path, item in pruned["paths"].items()} == expected
+    if expected == {"/orders": {"get"}}:
+        assert "PetList" not in pruned["components"]["schemas"]
+        assert "Order" in pruned["components"]["schemas"]